@@ -9,11 +9,11 @@
 # run another experiment, independent of all previous ones. No information
 # is shared between repetitions. This makes it a bit tricky, if the dataset
 # needs to be shuffled before (because all repetitions need the same 
-# permutation of the dataset). Here, this is implemented by generating a
-# unique hash-key from the dataset, whose first 7 digits are then used
-# to initialize the random number generator. This guarantees the same
-# split into batches for a given dataset. Use the flag shuffle=True if
-# you want to randomize the dataset.
+# permutation of the dataset). The built-in crossvalidation() method of
+# PyExperimentSuite takes care of this: the permutation only depends on
+# the size of the dataset and the 'seed' parameter (if given), and it is
+# computed only once and cached. Use the flag shuffle=True if you want to
+# randomize the dataset.
 #
 # Run this script from the command line on a single core: python suite.py -n1
 #
@@ -22,9 +22,10 @@
 # repetition. Change the repetitions number in the config file for
 # other splits.
 #
-# In order to use cross-validation in your experiments, copy the method
-# crossvalidation() to your suite class and pass the dataset array in from
-# the reset() method, as shown here.
+# In order to use cross-validation in your experiments, pass the dataset
+# array to the crossvalidation() method from the reset() method, as shown
+# here. If you only need the indices of the training and testing sets,
+# use crossvalidation_indices() instead.
 #
 # For cross-validation experiments, the API retrieval function 
 # get_histories_over_repetitions() is well suited to calculate the mean
@@ -37,7 +38,6 @@
 
 from expsuite import PyExperimentSuite
 from numpy import *
-import hashlib
 import os
 
 class MySuite(PyExperimentSuite):
@@ -46,44 +46,6 @@ class MySuite(PyExperimentSuite):
         PyExperimentSuite.__init__(self) 
         self.dataset = None
     
-    def crossvalidation(self, dataset, params, rep, shuffle=True):
-        """ This method takes a dataset in form of a numpy array of shape n x d,
-            where n is the number of data points and d is the dimensionality of 
-            the data. It further requires the current params dictionary and the
-            current repetition number. The flag 'shuffle' determines, if the
-            dataset should be shuffled before returning the training and testing
-            batches. There will be params['repetitions'] many equally sized batches, 
-            the rest of the dataset is discarded.
-        """
-        if params['repetitions'] < 2:
-            raise SystemExit('%i-fold cross validation does not make sense. Use at least 2 repetitions.'%params['repetitions'])
-        
-        key = int(hashlib.sha1(dataset).hexdigest()[:7], 16)
-        indices = list(range(dataset.shape[0]))
-        if shuffle:
-            # create permutation unique to dataset
-            random.seed(key)
-            indices = random.permutation(indices)
-               
-        batchsize = dataset.shape[0] // (params['repetitions'])
-        if batchsize == 0:
-            raise SystemExit('Too many repetitions for cross-validation with this dataset. Max. number of repetitions is %i.'%dataset.shape[0])
-        
-        batch = []
-        for i in range(params['repetitions']):
-            batch.append(dataset[indices[batchsize*i:batchsize*(i+1)]])
-
-        # create training and test data
-        trainset = zeros((0, batch[0].shape[1]), dtype=dataset.dtype)
-        for i,b in enumerate(batch):
-            if i == rep:
-                testset = b
-            else:
-                trainset = r_[trainset, b]
-        
-        return trainset, testset
-        
-        
     def reset(self, params, rep):
         """ To use the cross-validation mechanism, pass a numpy array of size n x d
             together with params and rep to the self.crossvalidation() method. 
@@ -1 +1 @@
-from expsuite import PyExperimentSuite
+from expsuite import PyExperimentSuite, ResultsClient, memoized
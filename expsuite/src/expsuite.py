@@ -20,10 +20,115 @@
 #############################################################################
 
 from configparser import ConfigParser
-from multiprocessing import Process, Pool, cpu_count
-from numpy import *
 import types
-import os, sys, time, itertools, re, optparse, types
+import os, sys, time, itertools, re, optparse, types, threading, importlib
+import json, struct, shutil, tempfile, hashlib, pickle, functools, numbers, warnings
+import copy
+
+
+class LazyModule(object):
+    """Helper class that imports a module on first attribute access. numpy
+    and multiprocessing are imported this way, so that importing expsuite
+    (e.g. for the expsuite command or for retrieving results) stays fast.
+    """
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+
+np = LazyModule("numpy")
+mp = LazyModule("multiprocessing")
+mp_pool = LazyModule("multiprocessing.pool")
+futures = LazyModule("concurrent.futures")
+asyncio = LazyModule("asyncio")
+inspect = LazyModule("inspect")
+
+try:
+    import fcntl
+except ImportError:
+    # no file locking available (e.g. on Windows)
+    fcntl = None
+
+# name of the single file a finished experiment is compacted into
+COMPACT_FILE = "compact.dat"
+
+# opened compacted stores, indexed by filename
+_compact_stores = {}
+
+# name of the file in the results path with the status records of all reps
+STATUS_FILE = "status.jsonl"
+
+# default port of the results server
+DEFAULT_PORT = 8765
+
+# retrieval functions of PyExperimentSuite answered by the results server
+SERVED_METHODS = (
+    "get_exps",
+    "get_params",
+    "get_history",
+    "get_history_tags",
+    "get_value",
+    "get_values_fix_params",
+    "get_histories_fix_params",
+    "get_histories_over_repetitions",
+)
+
+# number of threads reading config files in get_params_many(..)
+PARAMS_THREADS = 16
+
+# name of the file with the running aggregates over repetitions
+AGGREGATES_FILE = "aggregates.json"
+
+# methods of the suite that may be implemented as coroutines (async def)
+ASYNC_HOOKS = (
+    "reset",
+    "warm_start",
+    "iterate",
+    "iterate_batch",
+    "finalize",
+    "save_state",
+    "restore_state",
+)
+
+# experiment types that sample a budget of 'samples' grid points
+SAMPLING_TYPES = ("random", "lhs", "sobol", "halton")
+
+# direction numbers (s, a, m_1..m_s) of the Sobol sequence for dimensions
+# 2, 3, ... from S. Joe and F. Y. Kuo, "Constructing Sobol sequences with
+# better two-dimensional projections", SIAM J. Sci. Comput. 30, 2008
+SOBOL_DIRECTIONS = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+)
+
+# cross-validation permutations, indexed by dataset size, seed and shuffle.
+# they are kept at module level, because every task of a process pool
+# unpickles its own copy of the suite
+crossvalidation_permutations = {}
+
+# file extensions of the compression methods of finished logs (--compress)
+COMPRESSION = {"gzip": ".gz", "lzma": ".xz", "bz2": ".bz2"}
 
 
 def mp_runrep(args):
@@ -31,18 +136,822 @@ def mp_runrep(args):
     return PyExperimentSuite.run_rep(*args)
 
 
+def mp_copyrunrep(args):
+    """Helper function to run a repetition on a shallow copy of the suite,
+    so that threads sharing the suite don't share the state set in reset(..).
+    """
+    suite, params, rep = args
+    return copy.copy(suite).run_rep(params, rep)
+
+
+def mp_runthreads(args):
+    """Helper function to run func on all items of a chunk with one thread
+    per item, used by the hybrid processes x threads mode (see --threads).
+    """
+    func, chunk = args
+    pool = mp_pool.ThreadPool(processes=len(chunk))
+    try:
+        return pool.map(func, chunk)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def mp_runreps(tasks):
+    """Helper function to run several repetitions concurrently on an asyncio
+    event loop in one process (see --concurrency option).
+    """
+    return asyncio.run(run_concurrently(tasks))
+
+
+async def run_concurrently(tasks):
+    """Helper coroutine for mp_runreps(..). Each repetition runs on a
+    shallow copy of the suite, so that attributes set in reset(..) are not
+    shared between concurrent repetitions.
+    """
+    return await asyncio.gather(
+        *[copy.copy(suite).arun_rep(params, rep) for suite, params, rep in tasks]
+    )
+
+
+def chunks(iterable, size):
+    """Helper function to split an iterable into lists of size elements."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def sample_points(method, n, d, seed):
+    """Helper function to draw n points of the unit cube [0, 1)^d with one
+    of the SAMPLING_TYPES. The low-discrepancy sequences (sobol, halton) are
+    randomized by a shift drawn with the seed, so all methods are
+    reproducible and differ with the seed.
+    """
+    rs = np.random.RandomState(seed)
+    if method == "random":
+        return rs.random_sample((n, d))
+
+    if method == "lhs":
+        # one point in each of the n strata of every dimension
+        points = np.empty((n, d))
+        for k in range(d):
+            points[:, k] = (rs.permutation(n) + rs.random_sample(n)) / n
+        return points
+
+    if method == "sobol":
+        if d > len(SOBOL_DIRECTIONS) + 1:
+            raise SystemExit(
+                "sobol sampling supports at most %i parameters."
+                % (len(SOBOL_DIRECTIONS) + 1)
+            )
+        bits = 32
+        directions = np.empty((d, bits), dtype=np.uint64)
+        for k in range(d):
+            if k == 0:
+                m = [1] * bits
+            else:
+                deg, a, m = SOBOL_DIRECTIONS[k - 1]
+                m = list(m)
+                for i in range(deg, bits):
+                    value = m[i - deg] ^ (m[i - deg] << deg)
+                    for j in range(1, deg):
+                        if (a >> (deg - 1 - j)) & 1:
+                            value ^= m[i - j] << j
+                    m.append(value)
+            directions[k] = [m[i] << (bits - 1 - i) for i in range(bits)]
+        index = np.arange(n, dtype=np.uint64)
+        values = np.zeros((n, d), dtype=np.uint64)
+        for b in range(bits):
+            values[(index >> np.uint64(b)) & np.uint64(1) == 1] ^= directions[:, b]
+        values ^= rs.randint(0, 2**bits, d).astype(np.uint64)
+        return values / float(2**bits)
+
+    if method == "halton":
+        primes = []
+        candidate = 2
+        while len(primes) < d:
+            if all([candidate % p for p in primes]):
+                primes.append(candidate)
+            candidate += 1
+        points = np.zeros((n, d))
+        for k, base in enumerate(primes):
+            index = np.arange(n)
+            factor = 1.0
+            while index.any():
+                factor /= base
+                points[:, k] += factor * (index % base)
+                index //= base
+        return (points + rs.random_sample(d)) % 1.0
+
+    raise SystemExit("unknown sampling method '%s'." % method)
+
+
+def mp_benchrep(args):
+    """Helper function to allow multiprocessing support for benchmarks."""
+    return PyExperimentSuite.bench_rep(*args)
+
+
+def dispatch(pool, func, tasks, maxpending):
+    """Helper function to run func on every item of the (possibly lazy)
+    iterable tasks with the given worker pool. At most maxpending tasks are
+    queued at any time, so tasks are only generated when a worker is about
+    to become free. The first exception raised in a worker is re-raised.
+    """
+    pending = threading.BoundedSemaphore(maxpending)
+    errors = []
+
+    def done(result):
+        pending.release()
+
+    def failed(exc):
+        errors.append(exc)
+        pending.release()
+
+    for task in tasks:
+        pending.acquire()
+        if errors:
+            pending.release()
+            break
+        pool.apply_async(func, (task,), callback=done, error_callback=failed)
+
+    # wait for the remaining tasks to finish
+    for i in range(maxpending):
+        pending.acquire()
+
+    if errors:
+        raise errors[0]
+
+
+def memo_repr(value):
+    """Helper function that returns a string identifying value in the cache
+    key of PyExperimentSuite.cached_call(..). numpy arrays are digested with
+    their dtype and shape, because their repr is truncated.
+    """
+    if "numpy" in sys.modules and isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return "ndarray(%s)" % memo_repr(value.tolist())
+        digest = hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return "ndarray(%s, %s, %s)" % (value.dtype.str, value.shape, digest)
+    if isinstance(value, (list, tuple)):
+        return "%s(%s)" % (type(value).__name__, ", ".join(map(memo_repr, value)))
+    return repr(value)
+
+
+def memoized(*keys):
+    """Decorator for methods of a PyExperimentSuite subclass that take the
+    params dictionary as first argument, e.g. expensive preprocessing called
+    from reset(). The return value is cached on disk, keyed by the values of
+    the parameters named in keys (and any further arguments), and shared
+    between repetitions, worker processes and runs. See
+    PyExperimentSuite.cached_call(..).
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, params, *args):
+            return self.cached_call(types.MethodType(func, self), params, keys, *args)
+
+        return wrapper
+
+    return decorator
+
+
+def find_file(filename):
+    """Helper function to find a file that may have been compressed (see
+    --compress option). Returns the name of the existing file or None.
+    """
+    if os.path.exists(filename):
+        return filename
+    for ext in COMPRESSION.values():
+        if os.path.exists(filename + ext):
+            return filename + ext
+    return None
+
+
+def open_file(filename, mode="r"):
+    """Helper function to open a file found by find_file(..), compressed
+    files are decompressed transparently. Only for reading.
+    """
+    for method, ext in COMPRESSION.items():
+        if filename.endswith(ext):
+            if "b" not in mode:
+                mode += "t"
+            return importlib.import_module(method).open(filename, mode)
+    return open(filename, mode)
+
+
+def temp_name(filename):
+    """Helper function that returns the name of a temporary file next to
+    filename, unique per process and thread (reps may run in a thread pool).
+    """
+    return "%s.%i.%i.tmp" % (filename, os.getpid(), threading.get_ident())
+
+
+def compress_file(filename, method):
+    """Helper function to replace a file by its compressed version."""
+    target = filename + COMPRESSION[method]
+    tmpname = temp_name(target)
+    src = open(filename, "rb")
+    dst = importlib.import_module(method).open(tmpname, "wb")
+    shutil.copyfileobj(src, dst)
+    dst.close()
+    src.close()
+    os.replace(tmpname, target)
+    os.remove(filename)
+
+
+def decompress_file(filename):
+    """Helper function to restore a file from its compressed version."""
+    compressed = find_file(filename)
+    if compressed is None or compressed == filename:
+        return
+    tmpname = temp_name(filename)
+    src = open_file(compressed, "rb")
+    dst = open(tmpname, "wb")
+    shutil.copyfileobj(src, dst)
+    dst.close()
+    src.close()
+    os.replace(tmpname, filename)
+    os.remove(compressed)
+
+
 def progress(params, rep):
     """Helper function to calculate the progress made on one experiment."""
-    name = params["name"]
     fullpath = os.path.join(params["path"], params["name"])
-    logname = os.path.join(fullpath, "%i.log" % rep)
-    if os.path.exists(logname):
-        logfile = open(logname, "r")
+    return int(100 * log_lines(fullpath, rep) / params["iterations"])
+
+
+def log_lines(exp, rep):
+    """Helper function to count the lines logged for one repetition of
+    experiment exp, also if the log is compressed or compacted. Returns 0
+    if the repetition has not been started.
+    """
+    logname = find_file(os.path.join(exp, "%i.log" % rep))
+    if logname is not None:
+        logfile = open_file(logname, "r")
         lines = logfile.readlines()
         logfile.close()
-        return int(100 * len(lines) / params["iterations"])
-    else:
-        return 0
+        return len(lines)
+    store, key = find_compact(exp)
+    if store is not None and store.lines(key, rep) is not None:
+        return store.lines(key, rep)
+    return 0
+
+
+def count_lines(logname, st, cache):
+    """Helper function to count the lines of a log file with the stat result
+    st. cache maps absolute file names to [size, mtime, lines]. Unchanged
+    files are not read at all and since logs only grow, only the bytes
+    appended since the last call are read for all others. Compressed logs
+    are never appended to, they are read once as a whole.
+    """
+    key = os.path.abspath(logname)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime:
+        return cached[2]
+
+    offset, lines = 0, 0
+    if logname.endswith(tuple(COMPRESSION.values())):
+        logfile = open_file(logname, "rb")
+        for chunk in iter(lambda: logfile.read(1 << 20), b""):
+            lines += chunk.count(b"\n")
+        logfile.close()
+        cache[key] = [st.st_size, st.st_mtime, lines]
+        return lines
+
+    if cached is not None and cached[0] <= st.st_size:
+        offset, lines = cached[0], cached[2]
+    logfile = open(logname, "rb")
+    logfile.seek(offset)
+    while offset < st.st_size:
+        chunk = logfile.read(min(1 << 20, st.st_size - offset))
+        if not chunk:
+            break
+        lines += chunk.count(b"\n")
+        offset += len(chunk)
+    logfile.close()
+
+    cache[key] = [offset, st.st_mtime, lines]
+    return lines
+
+
+def pid_alive(pid):
+    """Helper function to check whether a process with this pid is running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def format_duration(seconds):
+    """Helper function to format a duration in seconds as [d days, ]h:mm:ss."""
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days:
+        return "%i days, %i:%02i:%02i" % (days, hours, minutes, seconds)
+    return "%i:%02i:%02i" % (hours, minutes, seconds)
+
+
+def reduce_histories(hist, lengths, which, padded):
+    """Helper function for get_values(..): reduces each row of hist, where
+    row i holds a history of length lengths[i] padded with NaN, to a single
+    value according to which. padded maps tags to (hist, lengths) of all
+    loaded tags, for the 'at_min' and 'at_max' reducers.
+    """
+    rows = np.arange(len(lengths))
+    empty = lengths == 0
+    result = np.full(len(lengths), np.nan)
+    if len(lengths) == 0:
+        return result
+
+    with warnings.catch_warnings():
+        # rows of missing repetitions are all NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+
+        if which == "last":
+            result = hist[rows, np.maximum(lengths - 1, 0)]
+        elif which == "first":
+            result = hist[:, 0]
+        elif which in ("min", "max", "mean", "median", "std"):
+            func = {"min": np.nanmin, "max": np.nanmax, "mean": np.nanmean}.get(which)
+            func = func or {"median": np.nanmedian, "std": np.nanstd}[which]
+            result = func(hist, axis=1)
+        elif which in ("argmin", "argmax"):
+            if which == "argmin":
+                result = np.where(np.isnan(hist), np.inf, hist).argmin(axis=1)
+            else:
+                result = np.where(np.isnan(hist), -np.inf, hist).argmax(axis=1)
+            result = result.astype(np.float64)
+        elif type(which) == str and which.startswith("p"):
+            result = np.nanpercentile(hist, float(which[1:]), axis=1)
+        elif type(which) == int:
+            index = which if which >= 0 else lengths + which
+            valid = (index >= 0) & (index < lengths)
+            index = np.where(valid, index, 0)
+            result = np.where(valid, hist[rows, index], np.nan)
+        elif type(which) == tuple and which[0] in ("at_min", "at_max"):
+            other, otherlengths = padded[which[1]]
+            if which[0] == "at_min":
+                index = np.where(np.isnan(other), np.inf, other).argmin(axis=1)
+            else:
+                index = np.where(np.isnan(other), -np.inf, other).argmax(axis=1)
+            valid = (index < lengths) & (otherlengths > 0)
+            index = np.where(valid, index, 0)
+            result = np.where(valid, hist[rows, index], np.nan)
+        else:
+            raise SystemExit("unknown value '%s' for 'which'." % str(which))
+
+    result = np.array(result, dtype=np.float64)
+    result[empty] = np.nan
+    return result
+
+
+# names that are looked up in numpy even if they occur on their own
+NUMPY_CONSTANTS = ("nan", "inf", "NaN", "Inf", "pi", "e", "newaxis")
+
+# globals for evaluating config and log values without numpy
+_eval_globals = {}
+
+
+def parse_which(which):
+    """Helper function to convert the --which option into the 'which'
+    argument of get_values(..): an iteration index, a tuple for
+    'at_min:tag' / 'at_max:tag' or a string.
+    """
+    if re.match(r"^-?[0-9]+$", which):
+        return int(which)
+    if which.startswith("at_min:") or which.startswith("at_max:"):
+        return tuple(which.split(":", 1))
+    return which
+
+
+def evaluate(expr):
+    """Helper function to evaluate a config or log value (float, int, list).
+    Names that are no builtins are looked up in numpy (e.g. nan, inf or
+    arange(..)). numpy is only imported when such a name occurs in a longer
+    expression or when it is one of NUMPY_CONSTANTS, so that plain strings
+    don't import it. Raises NameError or SyntaxError like eval().
+    """
+    try:
+        return eval(expr, _eval_globals)
+    except NameError:
+        if (
+            re.match(r"^\s*[A-Za-z_]\w*\s*$", expr)
+            and expr.strip() not in NUMPY_CONSTANTS
+        ):
+            raise
+        return eval(expr, vars(importlib.import_module("numpy")))
+
+
+def evaluate_value(val):
+    """Helper function to evaluate a logged value (float, int, list). If that
+    fails, the value is returned unchanged as string.
+    """
+    try:
+        return evaluate(val)
+    except (NameError, SyntaxError):
+        return val
+
+
+def read_log(logname):
+    """Helper function to read a log file without evaluating the values.
+    Returns the number of lines and a dictionary with the list of (string)
+    values for each tag. The log file may be compressed.
+    """
+    lines = 0
+    values = {}
+    logfile = open_file(logname, "r")
+    for line in logfile:
+        lines += 1
+        for pair in line.split():
+            tag, val = pair.split(":")
+            values.setdefault(tag, []).append(val)
+    logfile.close()
+    return lines, values
+
+
+class CompactStore(object):
+    """Read access to the single-file result store written by
+    PyExperimentSuite.compact(..). The file starts with a JSON header holding
+    the params table of all sub experiments and an index of all merged
+    repetitions, followed by the binary data of all numeric columns, which
+    is memory-mapped instead of loaded. Columns that are not numeric are
+    kept as strings in the header.
+    """
+
+    magic = b"EXPSUITECOMPACT1"
+
+    def __init__(self, filename):
+        self.filename = filename
+        f = open(filename, "rb")
+        if f.read(len(self.magic)) != self.magic:
+            f.close()
+            raise SystemExit("%s is not a compacted result store." % filename)
+        (size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(size).decode("utf-8"))
+        f.close()
+
+        self.params = header["params"]
+        self.reps = header["reps"]
+        if os.path.getsize(filename) > header["data"]:
+            self.data = np.memmap(
+                filename, dtype=np.uint8, mode="r", offset=header["data"]
+            )
+        else:
+            self.data = None
+
+    def lines(self, key, rep):
+        """returns the number of merged iterations of that repetition of sub
+        experiment key, or None if the repetition is not in the store.
+        """
+        entry = self.reps.get(key, {}).get(str(rep))
+        if entry is None:
+            return None
+        return entry["lines"]
+
+    def tags(self, key, rep):
+        """returns all tags of that repetition of sub experiment key."""
+        return list(self.reps[key][str(rep)]["columns"].keys())
+
+    def column(self, key, rep, tag):
+        """returns the values of one tag as array (numeric columns, memory
+        mapped) or list (other columns).
+        """
+        col = self.reps[key][str(rep)]["columns"][tag]
+        if "values" in col:
+            return [evaluate_value(v) for v in col["values"]]
+        dt = np.dtype(col["dtype"])
+        start = col["offset"]
+        return self.data[start : start + col["length"] * dt.itemsize].view(dt)
+
+    def history(self, key, rep, tag):
+        """like column(..), but always returns a list like get_history(..)."""
+        col = self.column(key, rep, tag)
+        if isinstance(col, np.ndarray):
+            return col.tolist()
+        return col
+
+    def raw_columns(self, key, rep):
+        """returns all columns of that repetition as they are passed to
+        write(..): numeric columns as arrays (loaded into memory) and all
+        other columns as lists of the logged strings.
+        """
+        cols = {}
+        for tag, col in self.reps[key][str(rep)]["columns"].items():
+            if "values" in col:
+                cols[tag] = col["values"]
+            else:
+                cols[tag] = np.array(self.column(key, rep, tag))
+        return cols
+
+    @staticmethod
+    def write(filename, params, reps, columns):
+        """writes a store file. params maps sub experiment keys to their
+        params table entry, reps maps keys to {rep: lines} and columns is a
+        dictionary of {(key, rep): {tag: values}}, where values is either a
+        numeric array or a list of strings.
+        """
+        header = {"params": params, "reps": {}}
+        data = tempfile.TemporaryFile()
+        offset = 0
+        for key in reps:
+            header["reps"][key] = {}
+            for rep in sorted(reps[key]):
+                cols = {}
+                for tag, values in columns[(key, rep)].items():
+                    if isinstance(values, np.ndarray):
+                        values = np.ascontiguousarray(values)
+                        cols[tag] = {
+                            "dtype": values.dtype.str,
+                            "offset": offset,
+                            "length": len(values),
+                        }
+                        raw = values.tobytes()
+                        # keep all columns 8-byte aligned for the memory map
+                        raw += b"\0" * (-len(raw) % 8)
+                        data.write(raw)
+                        offset += len(raw)
+                    else:
+                        cols[tag] = {"values": values}
+                header["reps"][key][str(rep)] = {
+                    "lines": reps[key][rep],
+                    "columns": cols,
+                }
+
+        # the data section starts at the first 64-byte boundary after the header
+        header["data"] = 0
+        size = len(json.dumps(header).encode("utf-8")) + 32
+        start = len(CompactStore.magic) + 8 + size
+        header["data"] = start + (-start % 64)
+        encoded = json.dumps(header).encode("utf-8").ljust(size)
+
+        tmpname = temp_name(filename)
+        f = open(tmpname, "wb")
+        f.write(CompactStore.magic)
+        f.write(struct.pack("<Q", len(encoded)))
+        f.write(encoded)
+        f.write(b"\0" * (header["data"] - f.tell()))
+        data.seek(0)
+        shutil.copyfileobj(data, f)
+        data.close()
+        f.close()
+        os.replace(tmpname, filename)
+
+
+def find_compact(exp):
+    """Helper function that returns the compacted store containing experiment
+    exp and the key of exp in that store, or (None, None). The store is
+    either in the experiment directory itself or, for sub experiments of
+    grid and list experiments, in the parent directory.
+    """
+    exp = os.path.normpath(exp)
+    for base in (exp, os.path.dirname(exp) or "."):
+        filename = os.path.join(base, COMPACT_FILE)
+        try:
+            st = os.stat(filename)
+        except OSError:
+            continue
+        stamp = (st.st_mtime, st.st_size)
+        if filename not in _compact_stores or _compact_stores[filename][0] != stamp:
+            _compact_stores[filename] = (stamp, CompactStore(filename))
+        store = _compact_stores[filename][1]
+        key = os.path.relpath(exp, base)
+        if key in store.params:
+            return store, key
+    return None, None
+
+
+def numeric_column(values):
+    """Helper function that converts a list of evaluated values into a numeric
+    array if all values are bools, ints or floats. Returns None otherwise.
+    """
+    kinds = set(type(v) for v in values)
+    if kinds and kinds <= set([bool]):
+        return np.array(values, dtype=bool)
+    if kinds and kinds <= set([int]):
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            return None
+    if kinds and kinds <= set([int, float]):
+        return np.array(values, dtype=np.float64)
+    return None
+
+
+class ResultsIndex(object):
+    """In-memory index of the results tree used by the results server. Log
+    files are parsed once; on later queries only appended lines are parsed.
+    The list of experiments is refreshed every few seconds.
+    """
+
+    refresh = 5.0
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.logs = {}
+        self.exps_cache = {}
+
+    def history(self, logname):
+        """returns the dictionary of evaluated values per tag of a log file,
+        or None if it does not exist.
+        """
+        logname = find_file(logname)
+        if logname is None:
+            return None
+        try:
+            size = os.path.getsize(logname)
+        except OSError:
+            return None
+        compressed = logname.endswith(tuple(COMPRESSION.values()))
+        with self.lock:
+            entry = self.logs.get(logname)
+            if entry is None or entry[0] > size or (compressed and entry[0] < size):
+                # new or rewritten log file
+                entry = [0, {}]
+                self.logs[logname] = entry
+            if entry[0] < size:
+                f = open_file(logname, "rb")
+                if compressed:
+                    data = f.read()
+                else:
+                    f.seek(entry[0])
+                    data = f.read(size - entry[0])
+                f.close()
+                # only parse complete lines, the rest is read next time
+                data = data[: data.rfind(b"\n") + 1]
+                values = {}
+                for line in data.decode("utf-8").splitlines():
+                    for pair in line.split():
+                        tag, val = pair.split(":")
+                        values.setdefault(tag, []).append(evaluate_value(val))
+                for tag in values:
+                    entry[1].setdefault(tag, []).extend(values[tag])
+                entry[0] = size if compressed else entry[0] + len(data)
+            return entry[1]
+
+    def exps(self, path, loader):
+        """returns the cached list of experiments below path."""
+        with self.lock:
+            cached = self.exps_cache.get(path)
+        if cached is None or time.time() - cached[0] > self.refresh:
+            cached = (time.time(), loader(path))
+            with self.lock:
+                self.exps_cache[path] = cached
+        return list(cached[1])
+
+
+class ResultsHandler(object):
+    """Request handling of the results server, mixed into a
+    BaseHTTPRequestHandler by PyExperimentSuite.serve(..). Each query is a
+    POST request to /<method> with a JSON body {"args": [...], "kwargs":
+    {...}}, the answer is the JSON encoded return value. GET / returns the
+    directory the server is running in.
+    """
+
+    def do_GET(self):
+        self.respond(200, {"cwd": os.getcwd()})
+
+    def do_POST(self):
+        method = self.path.strip("/")
+        if method not in SERVED_METHODS:
+            self.respond(404, {"error": "unknown method %s" % method})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            query = json.loads(self.rfile.read(length).decode("utf-8"))
+            args = list(query.get("args", []))
+            kwargs = dict(query.get("kwargs", {}))
+        except (ValueError, TypeError, AttributeError) as e:
+            self.respond(400, {"error": "malformed query: %s" % e})
+            return
+
+        try:
+            # aggregate functions are passed by their numpy name, either as
+            # positional or as keyword argument
+            if method == "get_histories_over_repetitions":
+                if len(args) > 2:
+                    args[2] = aggregate = getattr(np, str(args[2]), None)
+                else:
+                    name = str(kwargs.get("aggregate"))
+                    kwargs["aggregate"] = aggregate = getattr(np, name, None)
+                if not callable(aggregate):
+                    self.respond(400, {"error": "unknown aggregate function"})
+                    return
+            result = getattr(self.server.suite, method)(*args, **kwargs)
+        except (Exception, SystemExit) as e:
+            self.respond(500, {"error": "%s: %s" % (type(e).__name__, e)})
+            return
+        self.respond(200, {"result": result})
+
+    def respond(self, code, content):
+        body = json.dumps(content, default=to_json).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # don't print a line for every query
+        pass
+
+
+class ResultsClient(object):
+    """Client of the results server (see PyExperimentSuite.serve) with the
+    same retrieval functions as the suite (see SERVED_METHODS). If no server
+    is running in the same directory, or a query can not be sent to it, the
+    functions of the given suite are called directly instead.
+    """
+
+    def __init__(self, suite, port=DEFAULT_PORT, host="127.0.0.1", timeout=60):
+        import urllib.request
+
+        self.suite = suite
+        self.url = "http://%s:%i" % (host, port)
+        self.timeout = timeout
+        try:
+            answer = urllib.request.urlopen(self.url + "/", timeout=timeout)
+            self.connected = (
+                json.loads(answer.read().decode("utf-8"))["cwd"] == os.getcwd()
+            )
+            answer.close()
+        except (OSError, ValueError, KeyError):
+            self.connected = False
+
+    def query(self, method, args, kwargs):
+        """sends one query to the server, returns the result of the method
+        or calls it on the suite directly if that is not possible.
+        """
+        if self.connected:
+            import urllib.request, urllib.error
+
+            sentargs = list(args)
+            sentkwargs = dict(kwargs)
+            # aggregate functions can only be sent by their numpy name, either
+            # as positional or as keyword argument
+            if method == "get_histories_over_repetitions":
+                if len(sentargs) > 2:
+                    aggregate = sentargs[2]
+                else:
+                    aggregate = sentkwargs.get("aggregate")
+                name = getattr(aggregate, "__name__", None)
+                if name is None or getattr(np, name, None) is not aggregate:
+                    return getattr(self.suite, method)(*args, **kwargs)
+                if len(sentargs) > 2:
+                    sentargs[2] = name
+                else:
+                    sentkwargs["aggregate"] = name
+            body = json.dumps({"args": sentargs, "kwargs": sentkwargs}, default=to_json)
+            request = urllib.request.Request(
+                self.url + "/" + method,
+                data=body.encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+            )
+            try:
+                answer = urllib.request.urlopen(request, timeout=self.timeout)
+                result = json.loads(answer.read().decode("utf-8"))["result"]
+                answer.close()
+            except urllib.error.HTTPError as e:
+                raise SystemExit(json.loads(e.read().decode("utf-8"))["error"])
+            except OSError:
+                # server went away, don't try again
+                self.connected = False
+            else:
+                return from_json(method, result)
+        return getattr(self.suite, method)(*args, **kwargs)
+
+    def __getattr__(self, method):
+        if method not in SERVED_METHODS:
+            raise AttributeError(method)
+        return lambda *args, **kwargs: self.query(method, args, kwargs)
+
+
+def to_json(obj):
+    """Helper function to JSON encode numpy arrays and values."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError("%s is not JSON serializable" % type(obj).__name__)
+
+
+def from_json(method, result):
+    """Helper function to restore the types of a result of the server."""
+    if method == "get_histories_over_repetitions":
+        if isinstance(result, dict):
+            return dict((k, np.array(v)) for k, v in result.items())
+        return np.array(result)
+    if method in ("get_values_fix_params", "get_histories_fix_params"):
+        return tuple(result)
+    return result
 
 
 def convert_param_to_dirname(param):
@@ -53,6 +962,23 @@ def convert_param_to_dirname(param):
         return re.sub("0+$", "0", "%f" % param)
 
 
+def subexp_dirname(iterparams, values):
+    """Helper function that returns the directory name of the sub experiment
+    where the parameters iterparams take on the given values.
+    """
+    converted = str(list(zip(iterparams, list(map(convert_param_to_dirname, values)))))
+    return re.sub("[' \[\],()]", "", converted)
+
+
+def in_experiment(exp, parent):
+    """Helper function that returns True if the experiment directory exp is
+    parent or one of its sub experiments.
+    """
+    exp = os.path.normpath(exp)
+    parent = os.path.normpath(parent)
+    return exp == parent or exp.startswith(parent + os.sep)
+
+
 def is_iterable(thing):
     return not isinstance(thing, str) and hasattr(thing, "__iter__")
 
@@ -62,6 +988,21 @@ class PyExperimentSuite(object):
     # change this in subclass, if you support restoring state on iteration level
     restore_supported = False
 
+    # change this in subclass to compute iterations in blocks of this size
+    # with iterate_batch() instead of calling iterate() for each iteration
+    iterations_per_batch = None
+
+    # change this in subclass to maintain running aggregates over the
+    # repetitions while the experiments run (see get_aggregates)
+    track_aggregates = False
+
+    # maximum size in bytes of the on-disk cache of memoized() functions
+    memoize_limit = 2**30
+
+    # change this in subclass whenever the code changes the results, so that
+    # results of older code versions are not reused (see --reuse option)
+    code_version = None
+
     def __init__(self):
         self.parse_opt()
         self.parse_cfg()
@@ -69,8 +1010,22 @@ class PyExperimentSuite(object):
         # list of keys, that had to be renamed because they contained spaces
         self.key_warning_issued = []
 
+        # in-memory index of parsed results, only used by the results server
+        self.index = None
+
+        # parsed config files, indexed by filename
+        self.params_cache = {}
+
     def parse_opt(self):
         """parses the command line options for different settings."""
+        optparser = self.create_optparser()
+        options, args = optparser.parse_args()
+        self.optparser = optparser
+        self.options = options
+        return options, args
+
+    def create_optparser(self):
+        """returns the parser of the command line options."""
         optparser = optparse.OptionParser()
         optparser.add_option(
             "-c",
@@ -87,8 +1042,8 @@ class PyExperimentSuite(object):
             action="store",
             dest="ncores",
             type="int",
-            default=cpu_count(),
-            help="number of processes you want to use, default is %i" % cpu_count(),
+            default=os.cpu_count(),
+            help="number of processes you want to use, default is %i" % os.cpu_count(),
         )
         optparser.add_option(
             "-d",
@@ -130,10 +1085,126 @@ class PyExperimentSuite(object):
             default=False,
             help="like browse, but only shows name and progress bar",
         )
+        optparser.add_option(
+            "-w",
+            "--watch",
+            action="store_true",
+            dest="watch",
+            default=False,
+            help="continuously show the progress, speed and ETA of running experiments",
+        )
+        optparser.add_option(
+            "--serve",
+            action="store_true",
+            dest="serve",
+            default=False,
+            help="run a local server that answers result queries from memory",
+        )
+        optparser.add_option(
+            "--port",
+            action="store",
+            dest="port",
+            type="int",
+            default=DEFAULT_PORT,
+            help="port of the results server, default is %i" % DEFAULT_PORT,
+        )
+        optparser.add_option(
+            "--compact",
+            action="store_true",
+            dest="compact",
+            default=False,
+            help="merge the logs of all finished repetitions into one file per experiment",
+        )
+        optparser.add_option(
+            "--executor",
+            action="store",
+            dest="executor",
+            type="choice",
+            choices=["process", "thread"],
+            default="process",
+            help="run the repetitions in NUMCORES processes (default) or in NUMCORES threads sharing one suite",
+        )
+        optparser.add_option(
+            "--threads",
+            action="store",
+            dest="threads",
+            type="int",
+            default=1,
+            help="number of threads per process with --executor process, each running one repetition",
+        )
+        optparser.add_option(
+            "--concurrency",
+            action="store",
+            dest="concurrency",
+            type="int",
+            default=1,
+            help="number of repetitions each process runs concurrently on an asyncio event loop, for suites with async def iterate",
+        )
+        optparser.add_option(
+            "--benchmark",
+            action="store_true",
+            dest="benchmark",
+            default=False,
+            help="measure the speed of the experiments on 1, 2, 4, ... cores and project the runtime",
+        )
+        optparser.add_option(
+            "--bench-iterations",
+            action="store",
+            dest="bench_iterations",
+            type="int",
+            default=10,
+            help="number of iterations per repetition in --benchmark mode, default is 10",
+        )
+        optparser.add_option(
+            "--compress",
+            action="store",
+            dest="compress",
+            type="choice",
+            choices=list(COMPRESSION),
+            default=None,
+            help="compress the logs and state files of finished repetitions with gzip, lzma or bz2",
+        )
+        optparser.add_option(
+            "--reuse",
+            action="store_true",
+            dest="reuse",
+            default=False,
+            help="reuse finished repetitions of experiments with identical parameters",
+        )
+        optparser.add_option(
+            "--status-cache",
+            action="store_true",
+            dest="status_cache",
+            default=False,
+            help="keep a status cache for -b, -B and -p, so that unchanged experiments are not scanned again",
+        )
+        optparser.add_option(
+            "--cache",
+            action="store",
+            dest="cache",
+            type="string",
+            default=None,
+            help="directory for the suite's caches, default is ~/.cache/expsuite",
+        )
+        optparser.add_option(
+            "-q",
+            "--query",
+            action="store",
+            dest="query",
+            type="string",
+            default=None,
+            help="print the value of this tag for all repetitions of the existing experiments",
+        )
+        optparser.add_option(
+            "--which",
+            action="store",
+            dest="which",
+            type="string",
+            default="last",
+            help="value of the history printed by --query, e.g. last, max, p90, 10 or at_min:loss",
+        )
 
-        options, args = optparser.parse_args()
-        self.options = options
-        return options, args
+        return optparser
 
     def parse_cfg(self):
         """parses the given config file for experiments."""
@@ -146,22 +1217,197 @@ class PyExperimentSuite(object):
         if not os.path.exists(path):
             os.makedirs(path)
 
+    def cache_dir(self):
+        """returns the directory of the caches shared between runs."""
+        if self.options.cache:
+            return self.options.cache
+        return os.path.join(os.path.expanduser("~"), ".cache", "expsuite")
+
+    def params_hash(self, params):
+        """returns a hash of the parameters of one (sub) experiment and the
+        code_version of the suite. name and path are left out, as well as the
+        experiment type and sampling settings, because they don't influence
+        the results.
+        """
+        items = sorted(
+            (k, repr(v))
+            for k, v in params.items()
+            if k not in ("name", "path", "experiment", "samples", "sampling_seed")
+        )
+        key = json.dumps([repr(self.code_version), items])
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def cached_call(self, func, params, keys, *args):
+        """returns func(params, *args), cached on disk in the memo directory
+        of cache_dir(). the cache key consists of the name of func, the
+        values of the parameters named in keys, the further arguments and
+        the code_version of the suite. numpy arrays are stored as .npy files
+        and returned memory-mapped (read-only), also on the first call; all
+        other results are pickled.
+        when the cache grows beyond memoize_limit bytes, the least recently
+        used entries are removed.
+        """
+        memodir = os.path.join(self.cache_dir(), "memo")
+        self.mkdir(memodir)
+
+        name = "%s.%s" % (func.__module__, func.__qualname__)
+        values = [(k, memo_repr(params.get(k))) for k in keys]
+        key = json.dumps(
+            [name, repr(self.code_version), values, [memo_repr(a) for a in args]]
+        )
+        filename = os.path.join(memodir, hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+        # cache hit, mark entry as recently used
+        for ext in (".npy", ".pkl"):
+            if os.path.exists(filename + ext):
+                try:
+                    os.utime(filename + ext)
+                    if ext == ".npy":
+                        return np.load(filename + ext, mmap_mode="r")
+                    f = open(filename + ext, "rb")
+                    result = pickle.load(f)
+                    f.close()
+                    return result
+                except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+                    # entry evicted or corrupt, compute it again
+                    pass
+
+        result = func(params, *args)
+
+        # write to a temporary file first, other workers may read the cache
+        tmpname = temp_name(filename)
+        f = open(tmpname, "wb")
+        if isinstance(result, np.ndarray) and result.dtype != object:
+            np.save(f, result)
+            ext = ".npy"
+        else:
+            pickle.dump(result, f, pickle.HIGHEST_PROTOCOL)
+            ext = ".pkl"
+        f.close()
+        os.replace(tmpname, filename + ext)
+        if ext == ".npy":
+            # return the same read-only memmap as on a cache hit
+            result = np.load(filename + ext, mmap_mode="r")
+
+        self.evict_memoized(memodir)
+        return result
+
+    def evict_memoized(self, memodir):
+        """removes the least recently used entries of the memo cache until
+        its size is below memoize_limit.
+        """
+        entries = []
+        total = 0
+        for entry in os.scandir(memodir):
+            if entry.name.endswith((".npy", ".pkl")):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+
+        for mtime, size, path in sorted(entries):
+            if total <= self.memoize_limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def register_rep(self, params, rep):
+        """adds the directory of a finished repetition to the result cache,
+        so that experiments with identical parameters can reuse it.
+        """
+        registry = os.path.join(self.cache_dir(), "results")
+        self.mkdir(registry)
+        registry = os.path.join(registry, self.params_hash(params))
+        source = os.path.abspath(os.path.join(params["path"], params["name"]))
+        if os.path.exists(registry):
+            f = open(registry, "r")
+            sources = f.read().split("\n")
+            f.close()
+            if source in sources:
+                return
+        f = open(registry, "a")
+        f.write(source + "\n")
+        f.close()
+
+    def reuse_rep(self, params, rep):
+        """looks for a finished repetition with identical parameters (see
+        params_hash(..)) in the result cache. if one is found, its log file
+        and the files given by state_files(..) are copied into the directory
+        of this experiment. plain files are always copied, because they are
+        appended to or rewritten when the repetition is resumed; compressed
+        files are never written again and are hard linked if possible.
+        returns True if the repetition was reused.
+        """
+        registry = os.path.join(self.cache_dir(), "results", self.params_hash(params))
+        if not os.path.exists(registry):
+            return False
+
+        fullpath = os.path.join(params["path"], params["name"])
+        f = open(registry, "r")
+        sources = [s for s in f.read().split("\n") if s]
+        f.close()
+
+        for source in sources:
+            if os.path.abspath(fullpath) == source:
+                continue
+            # the files may have been compressed (see --compress option)
+            files = ["%i.log" % rep] + self.state_files(params, rep)
+            found = [find_file(os.path.join(source, fn)) for fn in files]
+            if None in found:
+                continue
+
+            # only reuse finished repetitions
+            logfile = open_file(found[0], "r")
+            lines = logfile.readlines()
+            logfile.close()
+            if len(lines) != params["iterations"]:
+                continue
+
+            for fn, sourcename in zip(files, found):
+                target = os.path.join(fullpath, fn)
+                while find_file(target) is not None:
+                    os.remove(find_file(target))
+                target += sourcename[len(os.path.join(source, fn)) :]
+                if target.endswith(tuple(COMPRESSION.values())):
+                    try:
+                        os.link(sourcename, target)
+                        continue
+                    except OSError:
+                        pass
+                shutil.copy2(sourcename, target)
+            return True
+
+        return False
+
     def get_exps(self, path="."):
         """go through all subdirectories starting at path and return the experiment
         identifiers (= directory names) of all existing experiments. A directory
         is considered an experiment if it contains a experiment.cfg file.
         """
-        exps = []
+        if self.index is not None:
+            return self.index.exps(path, self.find_exps)
+        return self.find_exps(path)
+
+    def find_exps(self, path="."):
+        """like get_exps(..), but always walks the directories."""
+        # directories with a config file, and those that have one below them
+        cfgdirs = []
+        parents = set()
         for dp, dn, fn in os.walk(path):
             if "experiment.cfg" in fn:
-                subdirs = [
-                    os.path.join(dp, d)
-                    for d in os.listdir(dp)
-                    if os.path.isdir(os.path.join(dp, d))
-                ]
-                if all([self.get_exps(s) == [] for s in subdirs]):
-                    exps.append(dp)
-        return exps
+                cfgdirs.append(dp)
+                parent = os.path.dirname(os.path.normpath(dp))
+                while parent not in parents:
+                    parents.add(parent)
+                    if os.path.dirname(parent) == parent:
+                        break
+                    parent = os.path.dirname(parent)
+        return [dp for dp in cfgdirs if os.path.normpath(dp) not in parents]
 
     def items_to_params(self, items):
         """evaluate the found items (strings) to become floats, ints or lists."""
@@ -169,11 +1415,11 @@ class PyExperimentSuite(object):
         for t, v in items:
             try:
                 # try to evaluate parameter (float, int, list)
-                if v in ["grid", "list"]:
+                if v in ["grid", "list"] + list(SAMPLING_TYPES):
                     params[t] = v
                 else:
-                    params[t] = eval(v)
-                if isinstance(params[t], ndarray):
+                    params[t] = evaluate(v)
+                if "numpy" in sys.modules and isinstance(params[t], np.ndarray):
                     params[t] = params[t].tolist()
             except (NameError, SyntaxError):
                 # otherwise assume string
@@ -181,9 +1427,48 @@ class PyExperimentSuite(object):
         return params
 
     def get_params(self, exp, cfgname="experiment.cfg"):
-        """reads the parameters of the experiment (= path) given."""
+        """reads the parameters of the experiment (= path) given. the parsed
+        parameters are cached until the config file changes; a (shallow)
+        copy of the cached dictionary is returned.
+        """
+        cfg = os.path.join(exp, cfgname)
+        try:
+            st = os.stat(cfg)
+        except OSError:
+            return self.read_params(exp, cfgname)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self.params_cache.get(cfg)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, self.read_params(exp, cfgname))
+            self.params_cache[cfg] = cached
+        return dict(cached[1])
+
+    def get_params_many(self, exps, cfgname="experiment.cfg"):
+        """like get_params(..) for a list of experiments, the config files are
+        read concurrently if there are more than PARAMS_THREADS of them.
+        returns the list of parameter dictionaries.
+        """
+        exps = list(exps)
+        if len(exps) <= PARAMS_THREADS:
+            # not worth starting a thread pool
+            return [self.get_params(exp, cfgname) for exp in exps]
+        executor = futures.ThreadPoolExecutor(max_workers=PARAMS_THREADS)
+        params = list(executor.map(lambda exp: self.get_params(exp, cfgname), exps))
+        executor.shutdown()
+        return params
+
+    def read_params(self, exp, cfgname="experiment.cfg"):
+        """reads the parameters of the experiment (= path) given from its
+        config file, without any caching.
+        """
         cfgp = ConfigParser()
-        cfgp.read(os.path.join(exp, cfgname))
+        if not cfgp.read(os.path.join(exp, cfgname)):
+            # fall back to the params table of a compacted store
+            store, key = find_compact(exp)
+            if store is not None:
+                params = self.items_to_params(store.params[key]["items"])
+                params["name"] = store.params[key]["name"]
+                return params
         section = cfgp.sections()[0]
         params = self.items_to_params(cfgp.items(section))
         params["name"] = section
@@ -221,9 +1506,7 @@ class PyExperimentSuite(object):
         strings or 'all', history is returned as a dictionary of lists
         of values.
         """
-        params = self.get_params(exp)
-
-        if params == None:
+        if not os.path.isdir(exp):
             raise SystemExit("experiment %s not found." % exp)
 
         # make list of tags, even if it is only one
@@ -232,31 +1515,47 @@ class PyExperimentSuite(object):
 
         results = {}
         logfile = os.path.join(exp, "%i.log" % rep)
-        try:
-            f = open(logfile)
-        except IOError:
-            if len(tags) == 1:
-                return []
-            else:
-                return {}
 
-        for line in f:
-            pairs = line.split()
-            for pair in pairs:
-                tag, val = pair.split(":")
-                if tags == "all" or tag in tags:
-                    if not tag in results:
-                        try:
-                            results[tag] = [eval(val)]
-                        except (NameError, SyntaxError):
-                            results[tag] = [val]
-                    else:
-                        try:
-                            results[tag].append(eval(val))
-                        except (NameError, SyntaxError):
-                            results[tag].append(val)
+        # repetitions merged by compact(..) are read from the compacted store
+        store, key = None, None
+        if find_file(logfile) is None:
+            store, key = find_compact(exp)
 
-        f.close()
+        if store is not None and store.lines(key, rep) is not None:
+            for tag in store.tags(key, rep):
+                if tags == "all" or tag in tags:
+                    results[tag] = store.history(key, rep, tag)
+        elif self.index is not None:
+            # results server: logs are parsed once and kept in memory
+            history = self.index.history(logfile)
+            if history is None:
+                if len(tags) == 1:
+                    return []
+                else:
+                    return {}
+            for tag in history:
+                if tags == "all" or tag in tags:
+                    results[tag] = list(history[tag])
+        else:
+            try:
+                f = open_file(find_file(logfile) or logfile)
+            except IOError:
+                if len(tags) == 1:
+                    return []
+                else:
+                    return {}
+
+            for line in f:
+                pairs = line.split()
+                for pair in pairs:
+                    tag, val = pair.split(":")
+                    if tags == "all" or tag in tags:
+                        if not tag in results:
+                            results[tag] = [evaluate_value(val)]
+                        else:
+                            results[tag].append(evaluate_value(val))
+
+            f.close()
         if len(results) == 0:
             if len(tags) == 1:
                 return []
@@ -323,6 +1622,72 @@ class PyExperimentSuite(object):
             else:
                 return None
 
+    def get_values(self, exps, tags, which="last", reps=None):
+        """batch version of get_value(..) for many experiments and all their
+        repetitions (or the repetitions in the list reps). each log file is
+        read only once and the histories are reduced with vectorized numpy
+        functions. the histories must be numeric.
+        'which' can be one of the following:
+                 last: the last value of the history
+                first: the first value of the history
+             min, max: the minimum / maximum value of the history
+        argmin,argmax: the iteration of the minimum / maximum value
+        mean,median,std: the mean / median / standard deviation
+                  p##: (e.g. 'p90') the ##-th percentile
+                    #: (int) the value at that index
+        ('at_min', t): the value at the iteration where tag t is minimal
+        ('at_max', t): the value at the iteration where tag t is maximal
+        if tags is a string, a matrix of shape (len(exps), repetitions) is
+        returned, if tags is a list of strings, a dictionary of matrices.
+        missing values are NaN.
+        """
+        single = not is_iterable(tags)
+        if single:
+            tags = [tags]
+        tags = list(tags)
+
+        # tags that need to be loaded
+        needed = list(tags)
+        if type(which) == tuple and which[1] not in needed:
+            needed.append(which[1])
+
+        if reps is None:
+            params = self.get_params_many(exps)
+            nreps = max([p["repetitions"] for p in params] + [0])
+            replists = [list(range(p["repetitions"])) for p in params]
+        else:
+            nreps = len(reps)
+            replists = [list(reps)] * len(exps)
+
+        results = dict((tag, np.full((len(exps), nreps), np.nan)) for tag in tags)
+        for i, exp in enumerate(exps):
+            # load all histories of this experiment, one load per log file
+            histories = dict((tag, []) for tag in needed)
+            for rep in replists[i]:
+                h = self.get_history(exp, rep, needed)
+                if len(needed) == 1:
+                    h = {needed[0]: h}
+                for tag in needed:
+                    histories[tag].append(h.get(tag, []))
+
+            # pad histories of all repetitions into one array per tag
+            padded = {}
+            for tag in needed:
+                lengths = np.array([len(h) for h in histories[tag]], dtype=int)
+                hist = np.full((len(lengths), max(list(lengths) + [1])), np.nan)
+                for j, h in enumerate(histories[tag]):
+                    hist[j, : len(h)] = h
+                padded[tag] = (hist, lengths)
+
+            for tag in tags:
+                results[tag][i, : len(replists[i])] = reduce_histories(
+                    padded[tag][0], padded[tag][1], which, padded
+                )
+
+        if single:
+            return results[tags[0]]
+        return results
+
     def get_values_fix_params(self, exp, rep, tag, which="last", **kwargs):
         """this function uses get_value(..) but returns all values where the
         subexperiments match the additional kwargs arguments. if alpha=1.0,
@@ -332,14 +1697,9 @@ class PyExperimentSuite(object):
         subexps = self.get_exps(exp)
         tagvalues = ["%s%s" % (k, convert_param_to_dirname(kwargs[k])) for k in kwargs]
 
-        values = [
-            self.get_value(se, rep, tag, which)
-            for se in subexps
-            if all([tv in se for tv in tagvalues])
-        ]
-        params = [
-            self.get_params(se) for se in subexps if all([tv in se for tv in tagvalues])
-        ]
+        subexps = [se for se in subexps if all([tv in se for tv in tagvalues])]
+        values = [self.get_value(se, rep, tag, which) for se in subexps]
+        params = self.get_params_many(subexps)
 
         return values, params
 
@@ -352,14 +1712,9 @@ class PyExperimentSuite(object):
         subexps = self.get_exps(exp)
         tagvalues = [re.sub("0+$", "0", "%s%f" % (k, kwargs[k])) for k in kwargs]
 
-        histories = [
-            self.get_history(se, rep, tag)
-            for se in subexps
-            if all([tv in se for tv in tagvalues])
-        ]
-        params = [
-            self.get_params(se) for se in subexps if all([tv in se for tv in tagvalues])
-        ]
+        subexps = [se for se in subexps if all([tv in se for tv in tagvalues])]
+        histories = [self.get_history(se, rep, tag) for se in subexps]
+        params = self.get_params_many(subexps)
 
         return histories, params
 
@@ -382,7 +1737,7 @@ class PyExperimentSuite(object):
         results = {}
         for tag in tags:
             # get all histories
-            histories = zeros((params["repetitions"], params["iterations"]))
+            histories = np.zeros((params["repetitions"], params["iterations"]))
             skipped = []
             for i in range(params["repetitions"]):
                 try:
@@ -421,11 +1776,11 @@ class PyExperimentSuite(object):
                         histories[i, :] = h
 
             # remove all rows that have been skipped
-            histories = delete(histories, skipped, axis=0)
+            histories = np.delete(histories, skipped, axis=0)
             params["repetitions"] -= len(skipped)
 
             # calculate result from each column with aggregation function
-            aggregated = zeros(params["iterations"])
+            aggregated = np.zeros(params["iterations"])
             for i in range(params["iterations"]):
                 aggregated[i] = aggregate(histories[:, i])
 
@@ -437,27 +1792,164 @@ class PyExperimentSuite(object):
 
         return results
 
+    def get_results_tensor(self, exp, tag, which="last"):
+        """returns the results of all sub experiments of the grid or list
+        experiment exp as one dense array. the array has one axis for each
+        iterable parameter, in the same order as expand_param_list(..) uses
+        them (a list experiment has a single axis for all of them), followed
+        by one axis for the repetitions. 'which' reduces each history like in
+        get_value(..) ('last', 'min', 'max' or an index); if which is 'all',
+        a last axis for the iterations is added instead. missing repetitions
+        and values are NaN.
+        returns the array and a list of (name, values) labels, one per axis.
+        """
+        params = self.get_params(exp)
+        iterparams = [p for p in params if is_iterable(params[p])]
+
+        # grid points as (index tuple, parameter values) in expansion order
+        if not iterparams:
+            axes = []
+            points = [((), None)]
+        elif "experiment" in params and params["experiment"] == "list":
+            values = list(zip(*[params[p] for p in iterparams]))
+            axes = [(tuple(iterparams), values)]
+            points = [((i,), v) for i, v in enumerate(values)]
+        elif "experiment" in params and params["experiment"] in SAMPLING_TYPES:
+            # only the sampled grid points exist, all others stay NaN
+            axes = [(p, list(params[p])) for p in iterparams]
+            points = [
+                (
+                    tuple([params[p].index(v) for p, v in zip(iterparams, values)]),
+                    values,
+                )
+                for values in self.sample_param_values(params, iterparams)
+            ]
+        else:
+            axes = [(p, list(params[p])) for p in iterparams]
+            points = zip(
+                itertools.product(*[range(len(params[p])) for p in iterparams]),
+                itertools.product(*[params[p] for p in iterparams]),
+            )
+
+        axes.append(("repetition", list(range(params["repetitions"]))))
+        if which == "all":
+            axes.append(("iteration", list(range(params["iterations"]))))
+        tensor = np.empty([len(a[1]) for a in axes])
+        tensor.fill(np.nan)
+
+        for idx, values in points:
+            if values is None:
+                se = exp
+            else:
+                se = os.path.join(exp, subexp_dirname(iterparams, values))
+            store, key = find_compact(se)
+
+            for rep in range(params["repetitions"]):
+                # read numeric columns of compacted stores without conversion
+                if (
+                    store is not None
+                    and store.lines(key, rep) is not None
+                    and find_file(os.path.join(se, "%i.log" % rep)) is None
+                    and tag in store.tags(key, rep)
+                ):
+                    h = np.asarray(store.column(key, rep, tag), dtype=np.float64)
+                else:
+                    h = np.array(self.get_history(se, rep, tag), dtype=np.float64)
+
+                if len(h) == 0:
+                    continue
+                if which == "all":
+                    h = h[: params["iterations"]]
+                    tensor[idx + (rep, slice(0, len(h)))] = h
+                elif which == "last":
+                    tensor[idx + (rep,)] = h[-1]
+                elif which == "min":
+                    tensor[idx + (rep,)] = h.min()
+                elif which == "max":
+                    tensor[idx + (rep,)] = h.max()
+                elif type(which) == int and -len(h) <= which < len(h):
+                    tensor[idx + (rep,)] = h[which]
+
+        return tensor, axes
+
+    def get_aggregates(self, exp, tags):
+        """returns the running aggregates over all finished repetitions,
+        which are maintained during the run if track_aggregates is set.
+        for each tag, a dictionary with arrays (one value per iteration) of
+        'count', 'mean', 'var', 'std', 'min' and 'max' is returned. if tags
+        is a list of strings or 'all', a dictionary of these dictionaries is
+        returned. the number of merged repetitions is available through
+        'repetitions'. returns None if no aggregates are available.
+        """
+        filename = os.path.join(exp, AGGREGATES_FILE)
+        if not os.path.exists(filename):
+            return None
+        f = open(filename, "r")
+        summary = json.load(f)
+        f.close()
+
+        if tags == "all":
+            tags = list(summary["tags"].keys())
+        single = not is_iterable(tags)
+        if single:
+            tags = [tags]
+
+        results = {}
+        for tag in tags:
+            if tag not in summary["tags"]:
+                continue
+            agg = dict(
+                (k, np.array(v, dtype=np.float64))
+                for k, v in summary["tags"][tag].items()
+            )
+            count = agg.pop("count")
+            m2 = agg.pop("m2")
+            agg["count"] = count.astype(int)
+            agg["mean"] = np.where(count > 0, agg["mean"], np.nan)
+            agg["var"] = np.where(count > 0, m2 / np.maximum(count, 1), np.nan)
+            agg["std"] = np.sqrt(agg["var"])
+            agg["repetitions"] = len(summary["repetitions"])
+            results[tag] = agg
+
+        if single:
+            return results.get(tags[0])
+        return results
+
     def browse(self):
         """go through all subfolders (starting at '.') and return information
         about the existing experiments. if the -B option is given, all
         parameters are shown, -b only displays the most important ones.
         this function does *not* execute any experiments.
+        the information of all experiments is collected in parallel, with one
+        pass over the files of each experiment (see scan_status(..)). if the
+        --status-cache option is given, the directory listings and the line
+        counts of the log files are kept in a status cache in cache_dir(),
+        so that only changed directories and unfinished logs are visited.
         """
-        for d in self.get_exps("."):
-            params = self.get_params(d)
-            name = params["name"]
-            basename = name.split("/")[0]
-            # if -e option is used, only show requested experiments
-            if self.options.experiments and basename not in self.options.experiments:
-                continue
+        cache = {}
+        cachename = None
+        if self.options.status_cache:
+            cachename = os.path.join(self.cache_dir(), "status.json")
+            if os.path.exists(cachename):
+                f = open(cachename, "r")
+                try:
+                    cache = json.load(f)
+                except ValueError:
+                    cache = {}
+                f.close()
+                if not isinstance(cache, dict) or "dirs" not in cache:
+                    cache = {}
 
-            fullpath = os.path.join(params["path"], name)
+        exps = self.get_exps(".")
+        executor = futures.ThreadPoolExecutor(max_workers=16)
+        statuses = executor.map(lambda d: self.scan_status(d, cache), exps)
 
-            # calculate progress
-            prog = 0
-            for i in range(params["repetitions"]):
-                prog += progress(params, i)
-            prog /= params["repetitions"]
+        for d, status in zip(exps, statuses):
+            # if -e option is used, only show requested experiments
+            if status is None:
+                continue
+            params = status["params"]
+            prog = status["progress"]
 
             # if progress flag is set, only show the progress bars
             if self.options.progress:
@@ -470,27 +1962,7 @@ class PyExperimentSuite(object):
 
             print(("%16s %s" % ("experiment", d)))
 
-            try:
-                minfile = min(
-                    (
-                        os.path.join(dirname, filename)
-                        for dirname, dirnames, filenames in os.walk(fullpath)
-                        for filename in filenames
-                        if filename.endswith((".log", ".cfg"))
-                    ),
-                    key=lambda fn: os.stat(fn).st_mtime,
-                )
-
-                maxfile = max(
-                    (
-                        os.path.join(dirname, filename)
-                        for dirname, dirnames, filenames in os.walk(fullpath)
-                        for filename in filenames
-                        if filename.endswith((".log", ".cfg"))
-                    ),
-                    key=lambda fn: os.stat(fn).st_mtime,
-                )
-            except ValueError:
+            if status["started"] is None:
                 print(("         started %s" % "not yet"))
 
             else:
@@ -498,8 +1970,7 @@ class PyExperimentSuite(object):
                     (
                         "         started %s"
                         % time.strftime(
-                            "%Y-%m-%d %H:%M:%S",
-                            time.localtime(os.stat(minfile).st_mtime),
+                            "%Y-%m-%d %H:%M:%S", time.localtime(status["started"])
                         )
                     )
                 )
@@ -507,8 +1978,7 @@ class PyExperimentSuite(object):
                     (
                         "           ended %s"
                         % time.strftime(
-                            "%Y-%m-%d %H:%M:%S",
-                            time.localtime(os.stat(maxfile).st_mtime),
+                            "%Y-%m-%d %H:%M:%S", time.localtime(status["ended"])
                         )
                     )
                 )
@@ -528,21 +1998,542 @@ class PyExperimentSuite(object):
                     print(("%16s %s" % (p, params[p])))
 
             print()
+        executor.shutdown()
+
+        if cachename is not None:
+            self.mkdir(os.path.dirname(cachename))
+            tmpname = temp_name(cachename)
+            f = open(tmpname, "w")
+            json.dump(cache, f)
+            f.close()
+            os.replace(tmpname, cachename)
+
+    def scan_status(self, exp, cache):
+        """collects the information that browse() shows about experiment exp:
+        its params, its progress and the first and last modification time of
+        its .log and .cfg files. all files are visited once with os.scandir.
+        returns None if the experiment is not selected with the -e option.
+        cache['dirs'] keeps the listing of each directory together with its
+        modification time and link count, and the modification time and
+        line count of its files. unchanged directories are not listed again
+        and only their unfinished logs are checked for new lines (with
+        cache['logs'], see count_lines(..)).
+        """
+        params = self.get_params(exp)
+        basename = params["name"].split("/")[0]
+        if self.options.experiments and basename not in self.options.experiments:
+            return None
+
+        logcache = cache.setdefault("logs", {})
+        dircache = cache.setdefault("dirs", {})
+        started = ended = None
+        lines = {}
+        logsuffixes = (".log",) + tuple([".log" + ext for ext in COMPRESSION.values()])
+        dirs = [exp]
+        while dirs:
+            dirname = dirs.pop()
+            st = os.stat(dirname)
+            stamp = [st.st_mtime_ns, st.st_nlink]
+            entry = dircache.get(os.path.abspath(dirname))
+            if entry is None or entry["stamp"] != stamp:
+                # files were added or removed, list the directory again
+                entry = {"stamp": stamp, "dirs": [], "files": {}}
+                for e in os.scandir(dirname):
+                    if e.is_dir():
+                        entry["dirs"].append(e.name)
+                    elif e.name.endswith(logsuffixes + (".cfg",)):
+                        entry["files"][e.name] = None
+                dircache[os.path.abspath(dirname)] = entry
+            dirs.extend([os.path.join(dirname, d) for d in entry["dirs"]])
+
+            for name, info in list(entry["files"].items()):
+                stem = name.split(".")[0]
+                islog = dirname == exp and stem.isdigit() and name.endswith(logsuffixes)
+                # only unfinished logs can still change
+                if info is None or (islog and info[1] < params["iterations"]):
+                    try:
+                        st = os.stat(os.path.join(dirname, name))
+                    except OSError:
+                        continue
+                    n = 0
+                    if islog:
+                        n = count_lines(os.path.join(dirname, name), st, logcache)
+                    info = [st.st_mtime, n]
+                    entry["files"][name] = info
+                if started is None or info[0] < started:
+                    started = info[0]
+                if ended is None or info[0] > ended:
+                    ended = info[0]
+                if islog:
+                    lines[int(stem)] = info[1]
+
+        # calculate progress
+        store, key = None, None
+        if len(lines) < params["repetitions"]:
+            store, key = find_compact(exp)
+        prog = 0
+        for i in range(params["repetitions"]):
+            if i in lines:
+                prog += int(100 * lines[i] / params["iterations"])
+            elif store is not None and store.lines(key, i) is not None:
+                prog += int(100 * store.lines(key, i) / params["iterations"])
+        prog /= params["repetitions"]
+
+        return {"params": params, "progress": prog, "started": started, "ended": ended}
+
+    def serve(self, port=DEFAULT_PORT):
+        """runs a results server on localhost:port until Ctrl-C is pressed.
+        the server loads all experiments below the current directory once
+        and keeps their params and parsed histories in memory; data appended
+        to the log files is parsed on the next query. it answers the
+        retrieval functions in SERVED_METHODS, see ResultsClient.
+        """
+        self.index = ResultsIndex()
+
+        # load the results tree once
+        exps = self.get_exps(".")
+        for exp in exps:
+            params = self.get_params(exp)
+            for rep in range(params["repetitions"]):
+                try:
+                    self.index.history(os.path.join(exp, "%i.log" % rep))
+                except ValueError:
+                    # malformed log, get_history will report it when queried
+                    pass
+        print("loaded %i experiments" % len(exps))
+
+        import http.server
+
+        handler = type(
+            "Handler", (ResultsHandler, http.server.BaseHTTPRequestHandler), {}
+        )
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+        server.suite = self
+        print("serving results of %s on http://127.0.0.1:%i" % (os.getcwd(), port))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        server.server_close()
+
+    def compact(self, exp):
+        """merges the log files of all finished repetitions of experiment exp
+        (including all its sub experiments and all tags) into one single
+        file, exp/compact.dat, which also contains a params table of all sub
+        experiments. the merged log files are deleted afterwards; unfinished
+        repetitions keep their log files so they can still be resumed.
+        all retrieval functions read from the compacted store transparently.
+        the store is locked while it is written (see uncompact(..)).
+        """
+        filename = os.path.join(exp, COMPACT_FILE)
+        lockfile = open(filename + ".lock", "a")
+        if fcntl is not None:
+            fcntl.flock(lockfile, fcntl.LOCK_EX)
+        try:
+            old = CompactStore(filename) if os.path.exists(filename) else None
+
+            params_table = {}
+            reps = {}
+            columns = {}
+            merged = []
+            for se in self.get_exps(exp):
+                key = os.path.relpath(se, exp)
+                params = self.get_params(se)
+                params_table[key] = {
+                    "name": params["name"],
+                    "items": [[p, str(params[p])] for p in params if p != "name"],
+                }
+                reps[key] = {}
+                for rep in range(params["repetitions"]):
+                    logname = find_file(os.path.join(se, "%i.log" % rep))
+                    if logname is not None:
+                        try:
+                            lines, values = read_log(logname)
+                        except ValueError:
+                            # malformed log (e.g. values with spaces), keep it
+                            continue
+                        if lines != params["iterations"]:
+                            continue
+                        cols = {}
+                        for tag in values:
+                            numeric = numeric_column(
+                                [evaluate_value(v) for v in values[tag]]
+                            )
+                            cols[tag] = numeric if numeric is not None else values[tag]
+                        merged.append(logname)
+                    elif old is not None and old.lines(key, rep) is not None:
+                        # keep repetitions that have been compacted before
+                        lines = old.lines(key, rep)
+                        cols = old.raw_columns(key, rep)
+                    else:
+                        continue
+                    reps[key][rep] = lines
+                    columns[(key, rep)] = cols
+
+            CompactStore.write(filename, params_table, reps, columns)
+            for logname in merged:
+                os.remove(logname)
+            return len(merged)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lockfile, fcntl.LOCK_UN)
+            lockfile.close()
+
+    def uncompact(self, exp, rep):
+        """moves repetition rep of (sub) experiment exp out of its compacted
+        store back into the log file exp/<rep>.log, so that it can be
+        resumed (e.g. after the iterations were increased). the store is
+        locked while it is rewritten without that repetition.
+        """
+        store, key = find_compact(exp)
+        if store is None:
+            return
+        lockfile = open(store.filename + ".lock", "a")
+        if fcntl is not None:
+            fcntl.flock(lockfile, fcntl.LOCK_EX)
+        try:
+            # read the store again, another process may have changed it
+            store, key = find_compact(exp)
+            if store is None or store.lines(key, rep) is None:
+                return
+
+            cols = store.raw_columns(key, rep)
+            columns = []
+            for tag, values in cols.items():
+                if isinstance(values, np.ndarray):
+                    values = [str(v) for v in values.tolist()]
+                columns.append((tag, values))
+            logfile = open(os.path.join(exp, "%i.log" % rep), "w")
+            for i in range(store.lines(key, rep)):
+                pairs = ["%s:%s" % (tag, v[i]) for tag, v in columns if i < len(v)]
+                logfile.write(" ".join(pairs) + "\n")
+            logfile.close()
+
+            reps = {}
+            columns = {}
+            for k in store.reps:
+                reps[k] = {}
+                for r in store.reps[k]:
+                    if k == key and int(r) == rep:
+                        continue
+                    reps[k][int(r)] = store.lines(k, r)
+                    columns[(k, int(r))] = store.raw_columns(k, r)
+            CompactStore.write(store.filename, store.params, reps, columns)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lockfile, fcntl.LOCK_UN)
+            lockfile.close()
+
+    def count_sub_experiments(self, params):
+        """returns the number of (sub) experiments that expand_param_list(..)
+        creates for one parameter dictionary, without expanding it.
+        """
+        if "experiment" in params and params["experiment"] == "single":
+            return 1
+        lengths = [len(params[p]) for p in params if is_iterable(params[p])]
+        if not lengths:
+            return 1
+        if "experiment" in params and params["experiment"] == "list":
+            return min(lengths)
+        if "experiment" in params and params["experiment"] in SAMPLING_TYPES:
+            iterparams = [p for p in params if is_iterable(params[p])]
+            return len(self.sample_param_values(params, iterparams))
+        count = 1
+        for l in lengths:
+            count *= l
+        return count
+
+    def benchmark(self, paramlist, iterations=10):
+        """runs every experiment in paramlist for the given number of
+        iterations on 1, 2, 4, ... up to --numcores processes (one repetition
+        per process) and prints the iterations per second, the mean time of
+        reset, iterate and save_state and the parallel efficiency, i.e. the
+        speedup over one process divided by the number of processes. from
+        the timings, the runtime of the whole experiment is projected. all
+        files are written to a temporary directory, which is deleted
+        afterwards, the results tree is not touched.
+        a discarded warm-up repetition runs first, so that one-time costs
+        (imports, caches) are not charged to the first measurement, and all
+        core counts (including 1) are measured in a pool of worker processes.
+        """
+        maxcores = max(self.options.ncores, 1)
+        cores = [1]
+        while cores[-1] * 2 < maxcores:
+            cores.append(cores[-1] * 2)
+        if maxcores > 1:
+            cores.append(maxcores)
+
+        tmpdir = tempfile.mkdtemp(prefix="expsuite-benchmark-")
+        try:
+            totaltime = 0.0
+            for params in paramlist:
+                nsub = self.count_sub_experiments(params)
+                benchparams = dict(params)
+                benchparams["path"] = tmpdir
+                benchparams["iterations"] = iterations
+                subexps = list(
+                    itertools.islice(self.iter_param_list(benchparams), maxcores)
+                )
+                for p in subexps:
+                    self.create_dir(p)
+                mp_benchrep((self, subexps[0], 0))
+
+                print(
+                    "benchmark of %s (%i sub experiments, %i iterations per repetition)"
+                    % (params["name"], nsub, iterations)
+                )
+                print(
+                    "%8s %10s %11s %10s %10s %10s"
+                    % ("cores", "it/s", "efficiency", "reset", "iterate", "save_state")
+                )
+                rate1 = None
+                for k in cores:
+                    tasks = [
+                        (self, subexps[i % len(subexps)], i // len(subexps))
+                        for i in range(k)
+                    ]
+                    pool = mp.Pool(processes=k)
+                    try:
+                        timings = pool.map(mp_benchrep, tasks)
+                    finally:
+                        pool.close()
+                        pool.join()
+                    # wall time from the first start to the last end of the
+                    # repetitions, without the startup of the worker pool
+                    wall = max([t["end"] for t in timings]) - min(
+                        [t["start"] for t in timings]
+                    )
+                    rate = k * iterations / max(wall, 1e-9)
+                    if rate1 is None:
+                        rate1 = rate
+
+                    # mean time per repetition (reset) and per iteration
+                    reset = sum([t["reset"] for t in timings]) / k
+                    iterate = sum([t["iterate"] for t in timings]) / (k * iterations)
+                    save = sum([t["save_state"] for t in timings]) / (k * iterations)
+                    print(
+                        "%8i %10.1f %10.0f%% %9.4fs %9.4fs %9.4fs"
+                        % (k, rate, 100.0 * rate / (k * rate1), reset, iterate, save)
+                    )
+
+                # projection with the timings on the most cores
+                # (at most one process per repetition)
+                reptime = reset + params["iterations"] * (iterate + save)
+                k = min(k, nsub * params["repetitions"])
+                projected = nsub * params["repetitions"] * reptime / k
+                totaltime += projected
+                print(
+                    "projected runtime of %i x %i repetitions x %i iterations on %i cores: %s"
+                    % (
+                        nsub,
+                        params["repetitions"],
+                        params["iterations"],
+                        k,
+                        format_duration(projected),
+                    )
+                )
+                print()
+            if len(paramlist) > 1:
+                print(
+                    "projected runtime of all experiments: %s"
+                    % format_duration(totaltime)
+                )
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def bench_rep(self, params, rep):
+        """runs a single repetition like run_rep(..) but without log files
+        and returns the time spent in reset, iterate (or iterate_batch) and
+        save_state in seconds, as well as the start and end time. methods
+        implemented as coroutines are run on an event loop.
+        """
+        loop = asyncio.new_event_loop() if self.is_async() else None
+
+        def call(hook, *args):
+            result = hook(*args)
+            if loop is not None and inspect.isawaitable(result):
+                result = loop.run_until_complete(result)
+            return result
+
+        timings = {"reset": 0.0, "iterate": 0.0, "save_state": 0.0}
+        t0 = timings["start"] = time.time()
+        call(self.reset, params, rep)
+        timings["reset"] = time.time() - t0
+
+        if self.iterations_per_batch:
+            blocks = range(0, params["iterations"], self.iterations_per_batch)
+        else:
+            blocks = range(params["iterations"])
+        for start in blocks:
+            t0 = time.time()
+            if self.iterations_per_batch:
+                stop = start + self.iterations_per_batch
+                if stop > params["iterations"]:
+                    stop = params["iterations"]
+                call(self.iterate_batch, params, rep, start, stop)
+            else:
+                stop = start + 1
+                call(self.iterate, params, rep, start)
+            t1 = time.time()
+            timings["iterate"] += t1 - t0
+            if self.restore_supported:
+                call(self.save_state, params, rep, stop - 1)
+                timings["save_state"] += time.time() - t1
+
+        call(self.finalize, params, rep)
+        timings["end"] = time.time()
+        if loop is not None:
+            loop.close()
+        return timings
+
+    def watch(self, paramlist, interval=2.0):
+        """shows the progress of the experiments in paramlist every interval
+        seconds until all repetitions are finished (or Ctrl-C is pressed):
+        the number of finished, running, queued and failed repetitions, the
+        iterations per second of each running experiment and worker process,
+        and an estimate of the remaining time of the whole sweep.
+        only the status records and log data appended since the last refresh
+        are read.
+        """
+        total = 0
+        totaliters = 0
+        paths = []
+        # the status file is shared by all experiments in a results path
+        exps = [os.path.join(p["path"], p["name"]) for p in paramlist]
+        for params in paramlist:
+            reps = self.count_sub_experiments(params) * params["repetitions"]
+            total += reps
+            totaliters += reps * params["iterations"]
+            if params["path"] not in paths:
+                paths.append(params["path"])
+
+        offsets = dict((p, 0) for p in paths)
+        states = {}
+        linecache = {}
+        first = None
+        last = None
+
+        try:
+            while True:
+                now = time.time()
+
+                # read the status records appended since the last refresh
+                for path in paths:
+                    filename = os.path.join(path, STATUS_FILE)
+                    if not os.path.exists(filename):
+                        continue
+                    f = open(filename, "r")
+                    f.seek(offsets[path])
+                    for line in f:
+                        if not line.endswith("\n"):
+                            break
+                        offsets[path] += len(line.encode("utf-8"))
+                        record = json.loads(line)
+                        if any(in_experiment(record["exp"], e) for e in exps):
+                            states[(record["exp"], record["rep"])] = record
+                    f.close()
+
+                done = [r for r in states.values() if r["event"] == "done"]
+                failed = [r for r in states.values() if r["event"] == "failed"]
+                active = []
+                for r in states.values():
+                    if r["event"] == "start":
+                        if pid_alive(r["pid"]):
+                            active.append(r)
+                        else:
+                            failed.append(r)
+
+                # iterations done per experiment and worker, only the new
+                # lines of the logs of running repetitions are read
+                iters = {}
+                for r in done + active:
+                    if r["event"] == "done":
+                        n = r["iterations"]
+                    else:
+                        logname = os.path.join(r["exp"], "%i.log" % r["rep"])
+                        try:
+                            n = count_lines(logname, os.stat(logname), linecache)
+                        except OSError:
+                            n = 0
+                    for key in (("exp", r["exp"]), ("pid", r["pid"])):
+                        iters[key] = iters.get(key, 0) + n
+                doneiters = sum([n for key, n in iters.items() if key[0] == "exp"])
+
+                # rates since the last refresh of running experiments and workers
+                expexp = {}
+                workers = {}
+                if last is not None and now > last[0]:
+                    for r in active:
+                        for key, rates in (
+                            (("exp", r["exp"]), expexp),
+                            (("pid", r["pid"]), workers),
+                        ):
+                            rates[key[1]] = (iters[key] - last[1].get(key, 0)) / (
+                                now - last[0]
+                            )
+                if first is None:
+                    first = (now, doneiters)
+                last = (now, iters)
+
+                print("\033[2J\033[H", end="")
+                print(
+                    "%s, refresh every %gs, Ctrl-C to quit"
+                    % (time.strftime("%Y-%m-%d %H:%M:%S"), interval)
+                )
+                queued = total - len(done) - len(active) - len(failed)
+                if queued < 0:
+                    queued = 0
+                print(
+                    "%16s %i done, %i active, %i queued, %i failed"
+                    % ("repetitions", len(done), len(active), queued, len(failed))
+                )
+
+                # estimate remaining time from the rate since the start
+                if now > first[0] and doneiters > first[1]:
+                    rate = (doneiters - first[1]) / (now - first[0])
+                    eta = (totaliters - doneiters) / rate
+                    print("%16s %.1f" % ("iterations/sec", rate))
+                    print("%16s %s" % ("ETA", format_duration(eta)))
+                else:
+                    print("%16s %s" % ("ETA", "unknown"))
+                print()
+
+                for exp in sorted(expexp):
+                    print("%10.1f it/s %s" % (expexp[exp], exp))
+                if workers:
+                    print()
+                for pid in sorted(workers):
+                    print("%10.1f it/s worker %i" % (workers[pid], pid))
+                sys.stdout.flush()
+
+                if not active and queued == 0 and states:
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
 
     def expand_param_list(self, paramlist):
         """expands the parameters list according to one of these schemes:
         grid: every list item is combined with every other list item
         list: every n-th list item of parameter lists are combined
+        returns the expanded parameter dictionaries as a list. see
+        iter_param_list(..) for a lazy version.
+        """
+        return list(self.iter_param_list(paramlist))
+
+    def iter_param_list(self, paramlist):
+        """generator version of expand_param_list(..). the combinations are
+        produced one at a time, so even huge grids can be iterated without
+        holding all parameter dictionaries in memory.
         """
         # for one single experiment, still wrap it in list
         if type(paramlist) == dict:
             paramlist = [paramlist]
 
         # get all options that are iteratable and build all combinations (grid) or tuples (list)
-        iparamlist = []
         for params in paramlist:
             if "experiment" in params and params["experiment"] == "single":
-                iparamlist.append(params)
+                yield params
             else:
                 iterparams = [p for p in params if is_iterable(params[p])]
                 if len(iterparams) > 0:
@@ -552,36 +2543,168 @@ class PyExperimentSuite(object):
                         params, os.path.join(params["path"], params["name"])
                     )
 
-                    # create sub experiments (check if grid or list is requested)
+                    # create sub experiments (check if grid, list or sampling is requested)
                     if "experiment" in params and params["experiment"] == "list":
-                        iterfunc = itertools.izip
+                        combinations = zip(*[params[p] for p in iterparams])
                     elif ("experiment" not in params) or (
                         "experiment" in params and params["experiment"] == "grid"
                     ):
-                        iterfunc = itertools.product
+                        # with warm starts, the warmstart parameter changes slowest
+                        order = list(iterparams)
+                        if "warmstart" in params:
+                            self.check_warm_start(params, iterparams)
+                            order.remove(params["warmstart"])
+                            order.insert(0, params["warmstart"])
+                        combinations = (
+                            tuple([c[order.index(p)] for p in iterparams])
+                            for c in itertools.product(*[params[p] for p in order])
+                        )
+                    elif params["experiment"] in SAMPLING_TYPES:
+                        combinations = self.sample_param_values(params, iterparams)
+                        if "warmstart" in params:
+                            self.check_warm_start(params, iterparams)
+                            k = iterparams.index(params["warmstart"])
+                            values = params[params["warmstart"]]
+                            combinations.sort(key=lambda c: values.index(c[k]))
                     else:
                         raise SystemExit(
-                            "unexpected value '%s' for parameter 'experiment'. Use 'grid', 'list' or 'single'."
+                            "unexpected value '%s' for parameter 'experiment'. Use 'grid', 'list', 'single', 'random', 'lhs', 'sobol' or 'halton'."
                             % params["experiment"]
                         )
 
-                    for il in iterfunc(*[params[p] for p in iterparams]):
+                    for il in combinations:
                         par = params.copy()
-                        converted = str(
-                            list(
-                                zip(iterparams, list(map(convert_param_to_dirname, il)))
-                            )
-                        )
-                        par["name"] = (
-                            par["name"] + "/" + re.sub("[' \[\],()]", "", converted)
-                        )
+                        par["name"] = par["name"] + "/" + subexp_dirname(iterparams, il)
                         for i, ip in enumerate(iterparams):
                             par[ip] = il[i]
-                        iparamlist.append(par)
+                        yield par
                 else:
-                    iparamlist.append(params)
+                    yield params
+
+    def check_warm_start(self, params, iterparams):
+        """checks that the warmstart parameter is one of the iterable
+        parameters of a grid or sampling experiment.
+        """
+        if params["warmstart"] not in iterparams:
+            raise SystemExit(
+                "warmstart parameter '%s' is not an iterable parameter of experiment %s."
+                % (params["warmstart"], params["name"])
+            )
+
+    def find_warm_start(self, params, rep):
+        """returns the directory of the sub experiment to warm start
+        repetition rep of the sub experiment params from, or None. if the
+        'warmstart' parameter is set in the config file, this is the sub
+        experiment nearest along that parameter (with the same values of
+        all other parameters) that has finished repetition rep. with --del,
+        only repetitions finished in this run are used (according to the
+        status records), as sub experiments that have not been dispatched
+        yet still contain the results of the previous run.
+        """
+        if "warmstart" not in params or "/" not in params["name"]:
+            return None
+        parent = os.path.join(params["path"], params["name"].split("/")[0])
+        parentparams = self.get_params(parent)
+        iterparams = [p for p in parentparams if is_iterable(parentparams[p])]
+        axis = params["warmstart"]
+        if axis not in iterparams:
+            return None
 
-        return iparamlist
+        # neighbours ordered by their distance along the axis
+        values = list(parentparams[axis])
+        if params[axis] not in values:
+            return None
+        index = values.index(params[axis])
+        neighbours = sorted(
+            [i for i in range(len(values)) if i != index],
+            key=lambda i: (abs(i - index), i),
+        )
+        finished = None
+        if self.options.delete:
+            finished = self.finished_reps(params["path"])
+        for i in neighbours:
+            combination = [values[i] if p == axis else params[p] for p in iterparams]
+            source = os.path.join(parent, subexp_dirname(iterparams, combination))
+            if finished is not None and (source, rep) not in finished:
+                continue
+            if log_lines(source, rep) == params["iterations"]:
+                return source
+        return None
+
+    def clear_status(self, path, exp):
+        """removes the status records of experiment exp (and its sub
+        experiments) from the status file of the results path. the records
+        of other experiments in the same path are kept.
+        """
+        filename = os.path.join(path, STATUS_FILE)
+        if not os.path.exists(filename):
+            return
+        f = open(filename, "r")
+        lines = []
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # incomplete last line of a record that is being written
+                continue
+            if not in_experiment(record["exp"], exp):
+                lines.append(line)
+        f.close()
+        tmpname = temp_name(filename)
+        f = open(tmpname, "w")
+        f.writelines(lines)
+        f.close()
+        os.replace(tmpname, filename)
+
+    def finished_reps(self, path):
+        """returns the set of (experiment, rep) tuples that have a 'done'
+        status record in the status file of the results path.
+        """
+        finished = set()
+        filename = os.path.join(path, STATUS_FILE)
+        if not os.path.exists(filename):
+            return finished
+        f = open(filename, "r")
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # incomplete last line of a record that is being written
+                continue
+            if record["event"] == "done":
+                finished.add((record["exp"], record["rep"]))
+        f.close()
+        return finished
+
+    def sample_param_values(self, params, iterparams):
+        """returns the parameter combinations of a sampling experiment (see
+        SAMPLING_TYPES): 'samples' points are drawn from the unit cube with
+        the seed 'sampling_seed' (default 0) and mapped to the values of the
+        iterable parameters iterparams. points that map to the same grid
+        point are only used once, so there can be fewer combinations.
+        """
+        if "samples" not in params:
+            raise SystemExit(
+                "experiment type '%s' requires the parameter 'samples'."
+                % params["experiment"]
+            )
+        lengths = np.array([len(params[p]) for p in iterparams])
+        points = sample_points(
+            params["experiment"],
+            params["samples"],
+            len(iterparams),
+            params.get("sampling_seed", 0),
+        )
+        indices = np.minimum((points * lengths).astype(int), lengths - 1)
+
+        combinations = []
+        seen = set()
+        for row in indices.tolist():
+            if tuple(row) in seen:
+                continue
+            seen.add(tuple(row))
+            combinations.append(tuple([params[p][i] for p, i in zip(iterparams, row)]))
+        return combinations
 
     def create_dir(self, params, delete=False):
         """creates a subdirectory for the experiment, and deletes existing
@@ -595,6 +2718,10 @@ class PyExperimentSuite(object):
         # delete old histories if --del flag is active
         if delete:
             os.system("rm %s/*" % fullpath)
+            # sub experiments are compacted into the parent directory
+            parent = os.path.join(os.path.dirname(fullpath), COMPACT_FILE)
+            if os.path.exists(parent):
+                os.remove(parent)
 
         # write a config file for this single exp. in the folder
         self.write_config_file(params, fullpath)
@@ -608,72 +2735,231 @@ class PyExperimentSuite(object):
             self.browse()
             raise SystemExit
 
-        # read main configuration file
+        # if --serve option is set, answer result queries until interrupted
+        if self.options.serve:
+            self.serve(self.options.port)
+            raise SystemExit
+
+        # if -q option is set, print the values of a tag and don't run
+        if self.options.query:
+            self.query(self.options.query, parse_which(self.options.which))
+            raise SystemExit
+
+        # if --benchmark option is set, time the experiments in a temporary
+        # directory instead of running them
+        if self.options.benchmark:
+            self.benchmark(self.get_paramlist(), self.options.bench_iterations)
+            raise SystemExit
+
+        # if -w option is set, monitor the running experiments
+        if self.options.watch:
+            self.watch(self.get_paramlist())
+            raise SystemExit
+
+        # if --compact option is set, merge finished logs instead of running
+        if self.options.compact:
+            for params in self.get_paramlist():
+                path = os.path.join(params["path"], params["name"])
+                if os.path.exists(path):
+                    n = self.compact(path)
+                    print("compacted %i log files into %s" % (n, path))
+            raise SystemExit
+
+        self.do_experiment(self.get_paramlist())
+
+    def get_paramlist(self):
+        """returns the parameter dictionaries of the experiments in the config
+        file, or only of those selected with the -e option. if the config
+        file has no experiments, the existing top-level experiments below '.'
+        are used instead (their experiment.cfg files contain all parameters).
+        """
         paramlist = []
         for exp in self.cfgparser.sections():
             if not self.options.experiments or exp in self.options.experiments:
                 params = self.items_to_params(self.cfgparser.items(exp))
                 params["name"] = exp
                 paramlist.append(params)
+        if self.cfgparser.sections():
+            return paramlist
+
+        for dp, dn, fn in os.walk("."):
+            if "experiment.cfg" not in fn:
+                continue
+            # sub experiments are part of their top-level experiment
+            dn[:] = []
+            params = self.get_params(dp)
+            if (
+                not self.options.experiments
+                or params["name"] in self.options.experiments
+            ):
+                params["path"] = os.path.dirname(os.path.normpath(dp))
+                paramlist.append(params)
+        return paramlist
 
-        self.do_experiment(paramlist)
+    def query(self, tag, which="last"):
+        """prints the value of tag for all repetitions of each existing
+        experiment (only those selected with the -e option), one line per
+        experiment. see get_values(..) for the possible values of which.
+        """
+        exps = sorted(self.get_exps("."))
+        params = self.get_params_many(exps)
+        selected = [
+            (exp, p)
+            for exp, p in zip(exps, params)
+            if not self.options.experiments
+            or p["name"].split("/")[0] in self.options.experiments
+        ]
+        values = self.get_values([exp for exp, p in selected], tag, which)
+        for (exp, p), row in zip(selected, values):
+            print(
+                "%s %s" % (exp, " ".join(["%g" % v for v in row[: p["repetitions"]]]))
+            )
 
     def do_experiment(self, params):
         """runs one experiment programatically and returns.
         params: either parameter dictionary (for one single experiment) or a list of parameter
         dictionaries (for several experiments).
         """
-        paramlist = self.expand_param_list(params)
+        if type(params) == dict:
+            params = [params]
 
-        # create directories, write config files
-        for pl in paramlist:
-            # check for required param keys
-            if (
+        # check for required param keys (sub experiments inherit them)
+        for pl in params:
+            if not (
                 ("name" in pl)
                 and ("iterations" in pl)
                 and ("repetitions" in pl)
                 and ("path" in pl)
             ):
-                self.create_dir(pl, self.options.delete)
-            else:
                 print(
                     "Error: parameter set does not contain all required keys: name, iterations, repetitions, path"
                 )
                 return False
 
-        # create experiment list
-        explist = []
-
-        # expand paramlist for all repetitions and add self and rep number
-        for p in paramlist:
-            explist.extend(
-                list(
-                    zip(
-                        [self] * p["repetitions"],
-                        [p] * p["repetitions"],
-                        list(range(p["repetitions"])),
-                    )
-                )
+        # with --del, the status records of earlier runs are outdated
+        if self.options.delete:
+            for pl in params:
+                self.clear_status(pl["path"], os.path.join(pl["path"], pl["name"]))
+
+        # expanding, creating directories and dispatching is done lazily, so
+        # that the first repetitions start before the whole grid is set up.
+        explist = self.iter_tasks(params)
+
+        # with --concurrency, each worker runs chunks of repetitions at once
+        runrep = mp_runrep
+        threaded = self.options.executor == "thread" or self.options.threads > 1
+        if self.options.concurrency > 1:
+            explist = chunks(explist, self.options.concurrency)
+            runrep = mp_runreps
+        elif threaded:
+            # threads share the suite, each repetition runs on a shallow copy
+            runrep = mp_copyrunrep
+
+        # hybrid mode: each process runs chunks of tasks on a pool of threads
+        if self.options.executor == "process" and self.options.threads > 1:
+            explist = zip(
+                itertools.repeat(runrep), chunks(explist, self.options.threads)
             )
+            runrep = mp_runthreads
 
         # if only 1 process is required call each experiment seperately (no worker pool)
-        if self.options.ncores == 1:
+        if self.options.ncores == 1 and self.options.executor == "process":
             for e in explist:
-                mp_runrep(e)
+                runrep(e)
         else:
-            # create worker processes
-            pool = Pool(processes=self.options.ncores)
-            pool.map(mp_runrep, explist)
+            # create worker processes (or threads of this process)
+            if self.options.executor == "thread":
+                pool = mp_pool.ThreadPool(processes=self.options.ncores)
+            else:
+                pool = mp.Pool(processes=self.options.ncores)
+            try:
+                dispatch(pool, runrep, explist, 2 * self.options.ncores)
+            finally:
+                pool.close()
+                pool.join()
 
         return True
 
+    def iter_tasks(self, params):
+        """generator over all (suite, params, rep) tuples of the given
+        experiments. the directory and experiment.cfg file of each (sub)
+        experiment are created just before its first repetition is handed out.
+        """
+        for p in self.iter_param_list(params):
+            # create directories, write config files
+            self.create_dir(p, self.options.delete)
+
+            # expand paramlist for all repetitions and add self and rep number
+            for rep in range(p["repetitions"]):
+                yield (self, p, rep)
+
     def run_rep(self, params, rep):
         """run a single repetition including directory creation, log files, etc."""
+        if self.is_async():
+            return asyncio.run(self.arun_rep(params, rep))
+        steps = self.rep_steps(params, rep)
+        result, error = None, None
+        while True:
+            try:
+                if error is None:
+                    hook, args = steps.send(result)
+                else:
+                    hook, args = steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                result, error = hook(*args), None
+            except BaseException as e:
+                result, error = None, e
+
+    async def arun_rep(self, params, rep):
+        """like run_rep(..), but awaits the methods of the suite that are
+        implemented as coroutines. other methods are called directly.
+        """
+        steps = self.rep_steps(params, rep)
+        result, error = None, None
+        while True:
+            try:
+                if error is None:
+                    hook, args = steps.send(result)
+                else:
+                    hook, args = steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                result, error = hook(*args), None
+                if inspect.isawaitable(result):
+                    result = await result
+            except BaseException as e:
+                result, error = None, e
+
+    def is_async(self):
+        """returns True if any method in ASYNC_HOOKS is a coroutine function."""
+        return any([inspect.iscoroutinefunction(getattr(self, h)) for h in ASYNC_HOOKS])
+
+    def rep_steps(self, params, rep):
+        """generator with the logic of run_rep(..). the calls of the methods
+        in ASYNC_HOOKS are yielded as (method, args) tuples and their return
+        values are sent back, so that run_rep(..) and arun_rep(..) share the
+        logging and restore logic. the return value is that of run_rep(..).
+        """
         name = params["name"]
         fullpath = os.path.join(params["path"], params["name"])
         logname = os.path.join(fullpath, "%i.log" % rep)
         # check if repetition exists and has been completed
         restore = 0
+
+        # compressed logs are complete, unless the iterations were increased
+        compressed = find_file(logname)
+        if compressed is not None and compressed != logname:
+            logfile = open_file(compressed, "r")
+            lines = logfile.readlines()
+            logfile.close()
+            if "iterations" in params and len(lines) == params["iterations"]:
+                return False
+            for fn in ["%i.log" % rep] + self.state_files(params, rep):
+                decompress_file(os.path.join(fullpath, fn))
+
         if os.path.exists(logname):
             logfile = open(logname, "r")
             lines = logfile.readlines()
@@ -690,44 +2976,326 @@ class PyExperimentSuite(object):
                 restore = 0
             else:
                 restore = len(lines)
-
-        self.reset(params, rep)
-
-        if restore:
-            logfile = open(logname, "a")
-            self.restore_state(params, rep, restore)
         else:
-            logfile = open(logname, "w")
+            # repetition may have been merged into a compacted store already
+            store, key = find_compact(fullpath)
+            if store is not None and store.lines(key, rep) is not None:
+                if store.lines(key, rep) == params["iterations"]:
+                    return False
+                # the iterations were increased, resume from a log file
+                self.uncompact(fullpath, rep)
+                return (yield from self.rep_steps(params, rep))
+
+            # an identical repetition may have been finished elsewhere
+            if self.options.reuse and self.reuse_rep(params, rep):
+                self.register_rep(params, rep)
+                self.write_status(params, rep, "done")
+                if self.track_aggregates:
+                    self.update_aggregates(
+                        params, rep, self.read_aggregate_values(params, rep)
+                    )
+                return False
 
-        # loop through iterations and call iterate
-        for it in range(restore, params["iterations"]):
-            dic = self.iterate(params, rep, it)
-            if self.restore_supported:
-                self.save_state(params, rep, it)
-
-            # replace all spaces in keys with underscores
-            for k in dic:
-                if " " in k:
-                    newk = k.replace(" ", "_")
-                    dic[newk] = dic[k]
-                    del dic[k]
-                    # issue warning but only once per key
-                    if k not in self.key_warning_issued:
-                        print(
-                            (
-                                "warning: key '%s' contained spaces and was renamed to '%s'"
-                                % (k, newk)
-                            )
+        self.write_status(params, rep, "start")
+        try:
+            # running aggregates of the numeric values of this repetition
+            aggregates = None
+            if self.track_aggregates:
+                aggregates = {}
+                if restore:
+                    aggregates = self.read_aggregate_values(params, rep)
+
+            yield self.reset, (params, rep)
+
+            if restore:
+                logfile = open(logname, "a")
+                yield self.restore_state, (params, rep, restore)
+            else:
+                logfile = open(logname, "w")
+
+                # start from the state of a finished neighbouring grid point
+                source = self.find_warm_start(params, rep)
+                if source is not None:
+                    yield self.warm_start, (params, rep, source)
+
+            # loop through blocks of iterations and call iterate_batch
+            if self.iterations_per_batch:
+                for start in range(
+                    restore, params["iterations"], self.iterations_per_batch
+                ):
+                    stop = start + self.iterations_per_batch
+                    if stop > params["iterations"]:
+                        stop = params["iterations"]
+                    dic = yield self.iterate_batch, (params, rep, start, stop)
+                    if self.restore_supported:
+                        yield self.save_state, (params, rep, stop - 1)
+                    dic = self.replace_key_spaces(dic)
+                    if aggregates is not None:
+                        self.feed_aggregates(
+                            aggregates, dic, start, params["iterations"], batch=True
                         )
-                        self.key_warning_issued.append(k)
 
-            # build string from dictionary
-            outstr = " ".join(["%s:%s" % (x[0], str(x[1])) for x in list(dic.items())])
-            logfile.write(outstr + "\n")
-            logfile.flush()
-        logfile.close()
+                    # convert columns to lists, then build all lines at once
+                    columns = []
+                    for k in dic:
+                        values = dic[k]
+                        if isinstance(values, np.ndarray) and (
+                            values.dtype == np.float64 or values.dtype.kind in "biu"
+                        ):
+                            values = values.tolist()
+                        if len(values) != stop - start:
+                            raise SystemExit(
+                                "iterate_batch returned %i values for key '%s' (expected: %i)."
+                                % (len(values), k, stop - start)
+                            )
+                        columns.append(["%s:%s" % (k, str(v)) for v in values])
+                    lines = [" ".join(line) + "\n" for line in zip(*columns)]
+                    logfile.write("".join(lines))
+                    logfile.flush()
+
+            # loop through iterations and call iterate
+            else:
+                for it in range(restore, params["iterations"]):
+                    dic = yield self.iterate, (params, rep, it)
+                    if self.restore_supported:
+                        yield self.save_state, (params, rep, it)
+                    dic = self.replace_key_spaces(dic)
+                    if aggregates is not None:
+                        self.feed_aggregates(aggregates, dic, it, params["iterations"])
+
+                    # build string from dictionary
+                    outstr = " ".join(
+                        ["%s:%s" % (x[0], str(x[1])) for x in list(dic.items())]
+                    )
+                    logfile.write(outstr + "\n")
+                    logfile.flush()
+            logfile.close()
+
+            yield self.finalize, (params, rep)
+
+            if aggregates is not None:
+                self.update_aggregates(params, rep, aggregates)
+
+            # compress the log and checkpoints of the finished repetition
+            if self.options.compress:
+                for fn in ["%i.log" % rep] + self.state_files(params, rep):
+                    if os.path.exists(os.path.join(fullpath, fn)):
+                        compress_file(os.path.join(fullpath, fn), self.options.compress)
+
+            if self.options.reuse:
+                self.register_rep(params, rep)
+        except BaseException:
+            self.write_status(params, rep, "failed")
+            raise
+        self.write_status(params, rep, "done")
+
+    def write_status(self, params, rep, event):
+        """appends a status record ('start', 'done' or 'failed') for a
+        repetition to the status file in the results path, which is
+        followed by the --watch mode.
+        """
+        record = {
+            "time": time.time(),
+            "pid": os.getpid(),
+            "event": event,
+            "exp": os.path.join(params["path"], params["name"]),
+            "rep": rep,
+            "iterations": params["iterations"],
+        }
+        f = open(os.path.join(params["path"], STATUS_FILE), "a")
+        f.write(json.dumps(record) + "\n")
+        f.close()
+
+    def feed_aggregates(self, aggregates, dic, start, iterations, batch=False):
+        """adds the numeric values of the dictionary returned by iterate()
+        for iteration start (or by iterate_batch() for the iterations
+        starting at start, if batch is True) to the arrays of values of the
+        current repetition. non-numeric values are ignored.
+        """
+        for k, v in dic.items():
+            if batch:
+                try:
+                    v = np.asarray(v, dtype=np.float64)
+                except (ValueError, TypeError):
+                    continue
+                if v.ndim != 1:
+                    continue
+                if k not in aggregates:
+                    aggregates[k] = np.full(iterations, np.nan)
+                aggregates[k][start : start + len(v)] = v
+            elif isinstance(v, numbers.Real):
+                if k not in aggregates:
+                    aggregates[k] = np.full(iterations, np.nan)
+                aggregates[k][start] = v
+
+    def read_aggregate_values(self, params, rep):
+        """reads the numeric values of an existing repetition from its log
+        file, as arrays like the ones collected by feed_aggregates(..).
+        """
+        values = {}
+        exp = os.path.join(params["path"], params["name"])
+        history = self.get_history(exp, rep, "all")
+        for tag in history:
+            try:
+                h = np.asarray(history[tag][: params["iterations"]], dtype=np.float64)
+            except (ValueError, TypeError):
+                continue
+            if h.ndim != 1:
+                continue
+            values[tag] = np.full(params["iterations"], np.nan)
+            values[tag][: len(h)] = h
+        return values
+
+    def update_aggregates(self, params, rep, values):
+        """merges the values of one finished repetition into the running
+        aggregates (count, mean, sum of squared deviations, min and max for
+        each tag and iteration) in the experiment's aggregates.json file.
+        the file is locked while it is updated, so that workers can finish
+        repetitions of the same experiment concurrently. if the number of
+        iterations has changed, the aggregates are extended to the longer
+        length; repetitions merged before keep their old length (their count
+        is 0 for the added iterations) and are not merged again.
+        """
+        filename = os.path.join(params["path"], params["name"], AGGREGATES_FILE)
+        f = open(filename, "a+")
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.seek(0)
+            text = f.read()
+            if text:
+                summary = json.loads(text)
+            else:
+                summary = {"repetitions": [], "tags": {}}
+
+            # a repetition is only merged once
+            if rep in summary["repetitions"]:
+                return
+            summary["repetitions"].append(rep)
+
+            for tag, x in values.items():
+                if tag not in summary["tags"]:
+                    summary["tags"][tag] = {
+                        "count": np.zeros(len(x)).tolist(),
+                        "mean": np.zeros(len(x)).tolist(),
+                        "m2": np.zeros(len(x)).tolist(),
+                        "min": np.full(len(x), np.nan).tolist(),
+                        "max": np.full(len(x), np.nan).tolist(),
+                    }
+                agg = dict(
+                    (k, np.array(v, dtype=np.float64))
+                    for k, v in summary["tags"][tag].items()
+                )
+
+                # pad to the same length, if the iterations have changed
+                length = max(len(x), len(agg["count"]))
+                for k in agg:
+                    fill = np.nan if k in ("min", "max") else 0.0
+                    agg[k] = np.concatenate(
+                        [agg[k], np.full(length - len(agg[k]), fill)]
+                    )
+                x = np.concatenate([x, np.full(length - len(x), np.nan)])
+                valid = ~np.isnan(x)
+
+                # Welford's update with one new value per iteration
+                count = agg["count"] + valid
+                delta = np.where(valid, x - agg["mean"], 0.0)
+                mean = agg["mean"] + np.where(valid, delta / np.maximum(count, 1), 0.0)
+                agg["m2"] += np.where(valid, delta * (x - mean), 0.0)
+                agg["mean"] = mean
+                agg["count"] = count
+                agg["min"] = np.where(valid, np.fmin(agg["min"], x), agg["min"])
+                agg["max"] = np.where(valid, np.fmax(agg["max"], x), agg["max"])
+
+                summary["tags"][tag] = dict((k, v.tolist()) for k, v in agg.items())
+
+            f.seek(0)
+            f.truncate()
+            json.dump(summary, f)
+            f.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            f.close()
+
+    def crossvalidation_indices(self, n, params, rep, shuffle=True):
+        """returns the indices of the training and the testing set of a
+        params['repetitions']-fold cross-validation over n data points, for
+        repetition rep. if shuffle is True, the data points are permuted
+        first. the permutation only depends on n and params['seed'] (if
+        given), so all repetitions use the same split into batches. it is
+        computed only once per worker process and cached at module level
+        (the suite itself is copied for every task). the testing indices are
+        a view into the cached permutation. there are params['repetitions']
+        many equally sized batches, the rest of the dataset is discarded.
+        """
+        if params["repetitions"] < 2:
+            raise SystemExit(
+                "%i-fold cross validation does not make sense. Use at least 2 repetitions."
+                % params["repetitions"]
+            )
+
+        batchsize = n // params["repetitions"]
+        if batchsize == 0:
+            raise SystemExit(
+                "Too many repetitions for cross-validation with this dataset. Max. number of repetitions is %i."
+                % n
+            )
+
+        seed = params.get("seed")
+        key = (n, seed, shuffle)
+        if key not in crossvalidation_permutations:
+            if shuffle:
+                perm = np.random.RandomState(seed or 0).permutation(n)
+            else:
+                perm = np.arange(n)
+            crossvalidation_permutations[key] = perm
+        perm = crossvalidation_permutations[key]
+
+        start = batchsize * rep
+        stop = batchsize * (rep + 1)
+        testidx = perm[start:stop]
+        trainidx = np.concatenate(
+            (perm[:start], perm[stop : batchsize * params["repetitions"]])
+        )
+        return trainidx, testidx
+
+    def crossvalidation(self, dataset, params, rep, shuffle=True):
+        """takes a dataset in form of a numpy array of shape n x d, where n
+        is the number of data points and d is the dimensionality of the data,
+        and returns the training and the testing set for repetition rep of a
+        cross-validation, see crossvalidation_indices(..). each set is
+        gathered with a single copy; if shuffle is False, the testing set is
+        a view of the dataset.
+        """
+        trainidx, testidx = self.crossvalidation_indices(
+            dataset.shape[0], params, rep, shuffle
+        )
+        if shuffle:
+            testset = dataset[testidx]
+        else:
+            testset = dataset[testidx[0] : testidx[-1] + 1]
+        return dataset[trainidx], testset
 
-        self.finalize(params, rep)
+    def replace_key_spaces(self, dic):
+        """replace all spaces in keys with underscores, so that they can be
+        written to the log files.
+        """
+        for k in list(dic.keys()):
+            if " " in k:
+                newk = k.replace(" ", "_")
+                dic[newk] = dic[k]
+                del dic[k]
+                # issue warning but only once per key
+                if k not in self.key_warning_issued:
+                    print(
+                        (
+                            "warning: key '%s' contained spaces and was renamed to '%s'"
+                            % (k, newk)
+                        )
+                    )
+                    self.key_warning_issued.append(k)
+        return dic
 
     def reset(self, params, rep):
         """needs to be implemented by subclass."""
@@ -738,6 +3306,20 @@ class PyExperimentSuite(object):
         ret = {"iteration": n, "repetition": rep}
         return ret
 
+    def iterate_batch(self, params, rep, start, stop):
+        """can be implemented by subclass together with iterations_per_batch
+        to compute the iterations start, ..., stop-1 at once. returns a
+        dictionary with one array (or list) of stop-start values per key,
+        which are written to the log file like the dictionaries returned by
+        iterate(). the default implementation calls iterate() for each
+        iteration.
+        """
+        ret = {}
+        for n in range(start, stop):
+            for k, v in self.iterate(params, rep, n).items():
+                ret.setdefault(k, []).append(v)
+        return ret
+
     def finalize(self, params, rep):
         """can be implemented by sublcass."""
         pass
@@ -746,6 +3328,24 @@ class PyExperimentSuite(object):
         """optionally can be implemented by subclass."""
         pass
 
+    def warm_start(self, params, rep, source_path):
+        """optionally can be implemented by subclass. if the 'warmstart'
+        parameter is set in the config file, this is called after reset(..)
+        for a new repetition, with the directory of the nearest finished sub
+        experiment along that parameter (see find_warm_start(..)). load the
+        state that save_state wrote there for repetition rep (the files may
+        be compressed, use open_file(find_file(..)) to read them).
+        """
+        pass
+
+    def state_files(self, params, rep):
+        """optionally can be implemented by subclass. returns the names of
+        the files (relative to the experiment directory) that save_state
+        writes for repetition rep. these files are reused together with the
+        log file (see --reuse option).
+        """
+        return []
+
     def restore_state(self, params, rep, n):
         """if the experiment supports restarting within a repetition
         (on iteration level), load necessary stored state in this
@@ -754,3 +3354,69 @@ class PyExperimentSuite(object):
         the experiments.
         """
         pass
+
+
+class ResultsBrowser(PyExperimentSuite):
+    """suite used by the expsuite command to browse, query, watch, serve
+    and compact existing results, without the suite that produced them.
+    the config file is optional, see get_paramlist(..).
+    """
+
+    # command line options of the read-only operations
+    browser_options = (
+        "--config",
+        "--experiment",
+        "--browse",
+        "--Browse",
+        "--progress",
+        "--query",
+        "--which",
+        "--watch",
+        "--serve",
+        "--port",
+        "--compact",
+        "--status-cache",
+        "--cache",
+    )
+
+    def create_optparser(self):
+        """returns the parser of the suite's command line options, without
+        the options for running experiments. their values keep the defaults.
+        """
+        optparser = PyExperimentSuite.create_optparser(self)
+        optparser.prog = "expsuite"
+        for option in list(optparser.option_list):
+            name = option.get_opt_string()
+            if name != "--help" and name not in self.browser_options:
+                optparser.remove_option(name)
+        return optparser
+
+    def parse_cfg(self):
+        """parses the config file for experiments, if it exists."""
+        self.cfgparser = ConfigParser()
+        self.cfgparser.read(self.options.config)
+
+
+def main():
+    """entry point of the expsuite command. only the read-only operations
+    (-b, -B, -p, -q, -w, --serve and --compact) are available, running
+    experiments needs the user's suite.
+    """
+    browser = ResultsBrowser()
+    options = browser.options
+    if not (
+        options.browse
+        or options.browse_big
+        or options.progress
+        or options.query
+        or options.watch
+        or options.serve
+        or options.compact
+    ):
+        browser.optparser.print_help()
+        raise SystemExit(2)
+    browser.start()
+
+
+if __name__ == "__main__":
+    main()
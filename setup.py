@@ -20,4 +20,7 @@ setuptools.setup(
     py_modules=["expsuite"],  # Name of the python package
     package_dir={"": "expsuite/src"},  # Directory of the source code of the package
     install_requires=["numpy"],  # Install other dependencies if any
+    entry_points={
+        "console_scripts": ["expsuite=expsuite:main"]
+    },  # Command line tool to browse and query existing results
 )
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "expsuite", "src"))
+
+from expsuite import PyExperimentSuite
+
+
+def make_config(repetitions=2, iterations=3, names=("exp",), **params):
+    """returns the text of an experiments.cfg with the experiments names in
+    the path results, each with the given parameters (written as given).
+    """
+    lines = [
+        "[DEFAULT]",
+        "repetitions = %i" % repetitions,
+        "iterations = %i" % iterations,
+        "path = results",
+    ]
+    for name in names:
+        lines += ["", "[%s]" % name]
+        lines += ["%s = %s" % (k, v) for k, v in params.items()]
+    return "\n".join(lines) + "\n"
+
+
+class SimpleSuite(PyExperimentSuite):
+    """logs the iteration n, x = alpha * n + rep and, if the parameter beta
+    is given, y = alpha * beta.
+    """
+
+    def iterate(self, params, rep, n):
+        result = {"n": n, "x": params.get("alpha", 1) * n + rep}
+        if "beta" in params:
+            result["y"] = params["alpha"] * params["beta"]
+        return result
+
+
+@pytest.fixture
+def make_suite(tmp_path, monkeypatch):
+    """returns a function that writes the config file into a temporary
+    working directory and creates a suite with the given command line
+    options (-n 1 unless given).
+    """
+    monkeypatch.chdir(tmp_path)
+
+    def make(cls, config, *args):
+        (tmp_path / "experiments.cfg").write_text(config)
+        argv = ["suite.py"] + list(args)
+        if "-n" not in args:
+            argv += ["-n", "1"]
+        monkeypatch.setattr(sys, "argv", argv)
+        return cls()
+
+    return make
@@ -0,0 +1,51 @@
+import json
+
+import numpy as np
+
+from expsuite import PyExperimentSuite
+
+CONFIG = """
+[DEFAULT]
+repetitions = %i
+iterations = %i
+path = results
+
+[exp]
+"""
+
+
+class AggregateSuite(PyExperimentSuite):
+    track_aggregates = True
+
+    def iterate(self, params, rep, n):
+        return {"x": float(rep * 10 + n)}
+
+
+def test_aggregates_match_histories(make_suite):
+    suite = make_suite(AggregateSuite, CONFIG % (3, 5))
+    suite.start()
+    agg = suite.get_aggregates("results/exp", "x")
+    hist = np.array([suite.get_history("results/exp", r, "x") for r in range(3)])
+    assert agg["repetitions"] == 3
+    assert np.allclose(agg["mean"], hist.mean(axis=0))
+    assert np.allclose(agg["std"], hist.std(axis=0))
+    assert np.allclose(agg["min"], hist.min(axis=0))
+    assert np.allclose(agg["max"], hist.max(axis=0))
+
+
+def test_changed_iterations(make_suite):
+    suite = make_suite(AggregateSuite, CONFIG % (2, 5))
+    suite.start()
+    suite = make_suite(AggregateSuite, CONFIG % (3, 8))
+    suite.start()
+
+    f = open("results/status.jsonl")
+    events = [json.loads(line)["event"] for line in f]
+    f.close()
+    assert "failed" not in events
+
+    agg = suite.get_aggregates("results/exp", "x")
+    assert agg["repetitions"] == 3
+    assert agg["count"].tolist() == [3] * 5 + [1] * 3
+    assert np.allclose(agg["mean"], [10, 11, 12, 13, 14, 25, 26, 27])
+    assert np.allclose(agg["max"][5:], [25, 26, 27])
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from expsuite import PyExperimentSuite
+
+CONFIG = """
+[DEFAULT]
+repetitions = 1
+iterations = 7
+path = results
+
+[batch]
+alpha = 2
+"""
+
+
+class BatchSuite(PyExperimentSuite):
+    iterations_per_batch = 3
+    restore_supported = True
+    calls = []
+    restored = None
+    short = False
+
+    def iterate_batch(self, params, rep, start, stop):
+        BatchSuite.calls.append((start, stop))
+        n = np.arange(start, stop)
+        names = ["it%i" % i for i in range(start, stop)]
+        if self.short:
+            names = names[:-1]
+        return {
+            "n": n,
+            "x": n * 0.5 * params["alpha"],
+            "even": n % 2 == 0,
+            "name": names,
+        }
+
+    def restore_state(self, params, rep, n):
+        BatchSuite.restored = n
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    BatchSuite.calls = []
+    BatchSuite.short = False
+    BatchSuite.restored = None
+
+
+def check_log(suite):
+    exp = "results/batch"
+    n = list(range(7))
+    assert suite.get_history(exp, 0, "n") == n
+    assert suite.get_history(exp, 0, "x") == [i * 1.0 for i in n]
+    assert suite.get_history(exp, 0, "even") == [i % 2 == 0 for i in n]
+    assert suite.get_history(exp, 0, "name") == ["it%i" % i for i in n]
+
+
+def test_batches_with_mixed_columns(make_suite):
+    suite = make_suite(BatchSuite, CONFIG)
+    suite.start()
+    # the last batch is shorter than iterations_per_batch
+    assert BatchSuite.calls == [(0, 3), (3, 6), (6, 7)]
+    check_log(suite)
+    f = open("results/batch/0.log")
+    assert f.readline() == "n:0 x:0.0 even:True name:it0\n"
+    f.close()
+
+
+def test_batch_length_mismatch(make_suite):
+    BatchSuite.short = True
+    with pytest.raises(SystemExit) as e:
+        make_suite(BatchSuite, CONFIG).start()
+    assert "returned 2 values for key 'name' (expected: 3)" in str(e.value)
+
+
+def test_restore_from_log_ending_mid_batch(make_suite):
+    suite = make_suite(BatchSuite, CONFIG)
+    suite.start()
+    f = open("results/batch/0.log")
+    lines = f.readlines()
+    f.close()
+    f = open("results/batch/0.log", "w")
+    f.writelines(lines[:4])
+    f.close()
+
+    BatchSuite.calls = []
+    suite = make_suite(BatchSuite, CONFIG)
+    suite.start()
+    assert BatchSuite.restored == 4
+    assert BatchSuite.calls == [(4, 7)]
+    check_log(suite)
@@ -0,0 +1,41 @@
+import time
+
+import pytest
+
+from expsuite import PyExperimentSuite
+
+CONFIG = """
+[DEFAULT]
+repetitions = 4
+iterations = 100
+path = results
+
+[exp]
+"""
+
+
+class SlowStartSuite(PyExperimentSuite):
+    # one-time cost per process, e.g. an import inside reset
+    started = False
+
+    def reset(self, params, rep):
+        if not SlowStartSuite.started:
+            time.sleep(0.5)
+            SlowStartSuite.started = True
+
+    def iterate(self, params, rep, n):
+        time.sleep(0.01)
+        return {"n": n}
+
+
+def test_benchmark_efficiency(make_suite, capsys, tmp_path):
+    suite = make_suite(SlowStartSuite, CONFIG, "--benchmark", "-n", "2")
+    with pytest.raises(SystemExit):
+        suite.start()
+    lines = capsys.readouterr().out.splitlines()
+    rows = [line.split() for line in lines[2:4]]
+    assert [row[0] for row in rows] == ["1", "2"]
+    efficiency = float(rows[1][2].rstrip("%"))
+    assert 50 <= efficiency <= 120
+    assert "projected runtime of 1 x 4 repetitions x 100 iterations" in lines[4]
+    assert not (tmp_path / "results").exists()
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+import expsuite
+
+from conftest import SimpleSuite, make_config
+
+CONFIG = make_config(iterations=4, alpha="[1, 2]")
+
+
+def browse_progress(make_suite, capsys, *args):
+    suite = make_suite(SimpleSuite, CONFIG, "-p", *args)
+    with pytest.raises(SystemExit):
+        suite.start()
+    out = capsys.readouterr().out
+    return dict(
+        (line.split()[-1], int(line.split("%")[0])) for line in out.splitlines()
+    )
+
+
+def test_status_cache(make_suite, capsys, monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    suite = make_suite(SimpleSuite, CONFIG)
+    suite.start()
+
+    # make one repetition unfinished
+    logname = "results/exp/alpha1.0/0.log"
+    f = open(logname)
+    lines = f.readlines()
+    f.close()
+    f = open(logname, "w")
+    f.writelines(lines[:2])
+    f.close()
+
+    progress = browse_progress(make_suite, capsys, "--status-cache")
+    assert progress == {"./results/exp/alpha1.0": 75, "./results/exp/alpha2.0": 100}
+    assert os.path.exists(tmp_path / "home" / ".cache" / "expsuite" / "status.json")
+
+    # unchanged directories are not listed again, finished logs not checked
+    scanned = []
+    stated = []
+    scandir, stat = os.scandir, os.stat
+
+    def counting(func, calls):
+        def wrapper(path, *args, **kwargs):
+            calls.append(str(path))
+            return func(path, *args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(expsuite.os, "scandir", counting(scandir, scanned))
+    monkeypatch.setattr(expsuite.os, "stat", counting(stat, stated))
+
+    f = open(logname, "a")
+    f.writelines(lines[2:])
+    f.close()
+    progress = browse_progress(make_suite, capsys, "--status-cache")
+    assert progress == {"./results/exp/alpha1.0": 100, "./results/exp/alpha2.0": 100}
+    cached = len(scanned)
+    assert [f for f in stated if f.endswith(".log")] == [
+        os.path.join("./results/exp/alpha1.0", "0.log")
+    ]
+
+    # without the option, both experiments are listed again (get_exps lists
+    # all directories in both cases)
+    del scanned[:]
+    progress = browse_progress(make_suite, capsys)
+    assert len(scanned) == cached + 2
@@ -0,0 +1,37 @@
+import sys
+
+import pytest
+
+import expsuite
+from expsuite import ResultsBrowser
+
+from conftest import SimpleSuite, make_config
+
+CONFIG = make_config(alpha="[1, 2]")
+
+
+def test_browser_only_has_read_only_options(make_suite, capsys, monkeypatch):
+    make_suite(SimpleSuite, CONFIG).start()
+    optparser = ResultsBrowser.create_optparser(ResultsBrowser.__new__(ResultsBrowser))
+    names = [o.get_opt_string() for o in optparser.option_list]
+    for name in ("--numcores", "--executor", "--threads", "--concurrency"):
+        assert name not in names
+    for name in ("--benchmark", "--compress", "--reuse", "--del"):
+        assert name not in names
+    assert "--query" in names
+
+    monkeypatch.setattr(sys, "argv", ["expsuite", "-n", "2"])
+    with pytest.raises(SystemExit) as e:
+        expsuite.main()
+    assert e.value.code == 2
+    assert "no such option" in capsys.readouterr().err
+
+
+def test_query_without_config(make_suite, capsys, monkeypatch, tmp_path):
+    make_suite(SimpleSuite, CONFIG).start()
+    (tmp_path / "experiments.cfg").unlink()
+    monkeypatch.setattr(sys, "argv", ["expsuite", "-q", "x", "--which", "max"])
+    with pytest.raises(SystemExit):
+        expsuite.main()
+    out = capsys.readouterr().out.splitlines()
+    assert out == ["./results/exp/alpha1.0 2 3", "./results/exp/alpha2.0 4 5"]
@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+
+from expsuite import PyExperimentSuite, CompactStore, COMPACT_FILE, progress
+
+CONFIG = """
+[DEFAULT]
+repetitions = 2
+iterations = %i
+path = results
+
+[exp]
+alpha = [1, 2]
+"""
+
+
+class MixedSuite(PyExperimentSuite):
+    restore_supported = True
+
+    def iterate(self, params, rep, n):
+        return {
+            "float": 0.1 * n + rep,
+            "int": n * params["alpha"],
+            "bool": n % 2 == 0,
+            "string": "it%i" % n,
+        }
+
+
+def histories(suite, exps, reps):
+    return dict(
+        ((exp, rep), suite.get_history(exp, rep, "all")) for exp in exps for rep in reps
+    )
+
+
+def test_round_trip(make_suite):
+    suite = make_suite(MixedSuite, CONFIG % 10)
+    suite.start()
+    exps = sorted(suite.get_exps("results/exp"))
+    before = histories(suite, exps, range(2))
+
+    assert suite.compact("results/exp") == 4
+    assert not [fn for fn in os.listdir(exps[0]) if fn.endswith(".log")]
+    assert histories(suite, exps, range(2)) == before
+
+    store = CompactStore(os.path.join("results/exp", COMPACT_FILE))
+    key = os.path.relpath(exps[0], "results/exp")
+    assert store.column(key, 0, "float").dtype == np.float64
+    assert store.column(key, 0, "int").dtype == np.int64
+    assert store.column(key, 0, "bool").dtype == bool
+    assert store.column(key, 0, "string") == ["it%i" % n for n in range(10)]
+    assert store.lines(key, 1) == 10
+
+
+def test_recompaction_keeps_old_repetitions(make_suite):
+    suite = make_suite(MixedSuite, CONFIG % 10)
+    suite.start()
+    suite.compact("results/exp")
+
+    suite = make_suite(
+        MixedSuite, (CONFIG % 10).replace("repetitions = 2", "repetitions = 3")
+    )
+    suite.start()
+    exps = sorted(suite.get_exps("results/exp"))
+    before = histories(suite, exps, range(3))
+    assert suite.compact("results/exp") == 2
+    assert histories(suite, exps, range(3)) == before
+    assert len(before[(exps[0], 0)]["int"]) == 10
+
+
+def test_compacted_repetitions_resume_with_more_iterations(make_suite):
+    suite = make_suite(MixedSuite, CONFIG % 10)
+    suite.start()
+    exps = sorted(suite.get_exps("results/exp"))
+    before = histories(suite, exps, range(2))
+    suite.compact("results/exp")
+
+    suite = make_suite(MixedSuite, CONFIG % 12)
+    suite.start()
+    for exp in exps:
+        params = suite.get_params(exp)
+        for rep in range(2):
+            assert progress(params, rep) == 100
+            history = suite.get_history(exp, rep, "all")
+            assert len(history["float"]) == 12
+            for tag in history:
+                assert history[tag][:10] == before[(exp, rep)][tag]
+    assert suite.compact("results/exp") == 4
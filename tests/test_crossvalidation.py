@@ -0,0 +1,68 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from expsuite import PyExperimentSuite
+
+from conftest import make_config
+
+CONFIG = make_config(repetitions=4, iterations=1, names=("cv",))
+
+
+@pytest.fixture
+def suite(make_suite):
+    return make_suite(PyExperimentSuite, CONFIG)
+
+
+def folds(suite, n, params, shuffle=True):
+    return [
+        suite.crossvalidation_indices(n, params, rep, shuffle)
+        for rep in range(params["repetitions"])
+    ]
+
+
+def test_folds_are_disjoint_and_cover_the_batches(suite):
+    params = {"repetitions": 4, "seed": 3}
+    # 2 points are discarded, batchsize is 5
+    result = folds(suite, 22, params)
+    tests = np.concatenate([test for train, test in result])
+    assert len(tests) == 20
+    assert len(set(tests.tolist())) == 20
+    for train, test in result:
+        assert len(test) == 5 and len(train) == 15
+        assert not set(train.tolist()) & set(test.tolist())
+        # all repetitions split the same points
+        assert set(train.tolist()) | set(test.tolist()) == set(tests.tolist())
+
+
+def test_folds_are_stable_across_processes_and_seeds(suite):
+    params = {"repetitions": 4, "seed": 3}
+    first = folds(suite, 22, params)
+
+    # a worker process unpickles its own copy of the suite for every task
+    copied = pickle.loads(pickle.dumps(suite))
+    for (train, test), (train2, test2) in zip(first, folds(copied, 22, params)):
+        np.testing.assert_array_equal(train, train2)
+        np.testing.assert_array_equal(test, test2)
+        # the permutation is computed only once
+        assert np.shares_memory(test, test2)
+
+    other = folds(suite, 22, {"repetitions": 4, "seed": 4})
+    assert not all(np.array_equal(a[1], b[1]) for a, b in zip(first, other))
+    assert folds(suite, 22, {"repetitions": 4})[0][1].tolist() == (
+        folds(suite, 22, {"repetitions": 4, "seed": 0})[0][1].tolist()
+    )
+
+
+def test_unshuffled_testset_is_a_view(suite):
+    params = {"repetitions": 4}
+    dataset = np.arange(40.0).reshape(20, 2)
+    for rep in range(4):
+        trainset, testset = suite.crossvalidation(dataset, params, rep, shuffle=False)
+        assert np.shares_memory(testset, dataset)
+        np.testing.assert_array_equal(testset, dataset[5 * rep : 5 * (rep + 1)])
+        assert len(trainset) == 15
+
+    trainset, testset = suite.crossvalidation(dataset, params, 1, shuffle=True)
+    assert not np.shares_memory(testset, dataset)
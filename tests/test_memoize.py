@@ -0,0 +1,84 @@
+import os
+import time
+
+import numpy as np
+
+from expsuite import PyExperimentSuite, memoized
+
+CONFIG = """
+[DEFAULT]
+repetitions = 4
+iterations = 1
+path = results
+
+[m]
+alpha = 1
+"""
+
+
+class MemoSuite(PyExperimentSuite):
+    @memoized("alpha")
+    def prepare(self, params):
+        time.sleep(0.2)
+        return {"alpha": params["alpha"]}
+
+    def reset(self, params, rep):
+        self.data = self.prepare(params)
+
+    def iterate(self, params, rep, n):
+        return {"alpha": self.data["alpha"]}
+
+
+def test_memoized_under_thread_executor(make_suite, tmp_path):
+    cache = str(tmp_path / "cache")
+    suite = make_suite(
+        MemoSuite, CONFIG, "-n", "4", "--executor", "thread", "--cache", cache
+    )
+    suite.start()
+
+    exp = "results/m"
+    for rep in range(4):
+        assert suite.get_value(exp, rep, "alpha") == 1
+    memodir = os.path.join(cache, "memo")
+    names = os.listdir(memodir)
+    assert [n for n in names if n.endswith(".tmp")] == []
+    assert len([n for n in names if n.endswith(".pkl")]) == 1
+
+
+class ArraySuite(PyExperimentSuite):
+    calls = 0
+
+    @memoized("alpha")
+    def total(self, params, data):
+        ArraySuite.calls += 1
+        return np.cumsum(data)
+
+
+def test_memoized_array_arguments_are_digested(make_suite, tmp_path):
+    suite = make_suite(ArraySuite, CONFIG, "--cache", str(tmp_path / "cache"))
+    params = {"alpha": 1}
+    a = np.zeros(10000)
+    b = np.zeros(10000)
+    b[5000] = 1.0
+    # the repr of both arrays is the same truncated string
+    assert repr(a) == repr(b)
+
+    ArraySuite.calls = 0
+    assert suite.total(params, a)[-1] == 0.0
+    assert suite.total(params, b)[-1] == 1.0
+    assert suite.total(params, a.astype(np.float32))[-1] == 0.0
+    assert ArraySuite.calls == 3
+    suite.total(params, b)
+    assert ArraySuite.calls == 3
+
+
+def test_memoized_array_result_is_read_only_on_miss_and_hit(make_suite, tmp_path):
+    suite = make_suite(ArraySuite, CONFIG, "--cache", str(tmp_path / "cache"))
+    params = {"alpha": 1}
+    data = np.arange(5.0)
+    first = suite.total(params, data)
+    second = suite.total(params, data)
+    for result in (first, second):
+        assert isinstance(result, np.memmap)
+        assert not result.flags.writeable
+    np.testing.assert_array_equal(first, second)
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+import expsuite
+from expsuite import PyExperimentSuite
+
+from conftest import make_config
+
+CONFIG = make_config(repetitions=1, iterations=1, names=("p",))
+
+
+def write_config(exp, alpha, mtime):
+    os.makedirs(exp, exist_ok=True)
+    name = os.path.join(exp, "experiment.cfg")
+    f = open(name, "w")
+    f.write("[p]\nalpha = %i\n" % alpha)
+    f.close()
+    os.utime(name, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def suite(make_suite, monkeypatch):
+    suite = make_suite(PyExperimentSuite, CONFIG)
+    suite.reads = []
+    read_params = suite.read_params
+
+    def counting(exp, cfgname="experiment.cfg"):
+        suite.reads.append(exp)
+        return read_params(exp, cfgname)
+
+    monkeypatch.setattr(suite, "read_params", counting)
+    return suite
+
+
+def test_params_cache_is_invalidated_on_change(suite):
+    write_config("results/p", 1, 10**18)
+    assert suite.get_params("results/p")["alpha"] == 1
+    assert suite.get_params("results/p")["alpha"] == 1
+    assert suite.reads == ["results/p"]
+
+    # same size, only the modification time differs
+    write_config("results/p", 2, 10**18 + 1)
+    assert suite.get_params("results/p")["alpha"] == 2
+    assert suite.reads == ["results/p"] * 2
+
+    # the returned dictionary is a copy of the cached one
+    suite.get_params("results/p")["alpha"] = 3
+    assert suite.get_params("results/p")["alpha"] == 2
+
+
+def test_params_many_reads_few_configs_sequentially(suite, monkeypatch):
+    exps = ["results/p/%i" % i for i in range(3 * expsuite.PARAMS_THREADS)]
+    for i, exp in enumerate(exps):
+        write_config(exp, i, 10**18)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("thread pool started")
+
+    few = exps[: expsuite.PARAMS_THREADS]
+    with monkeypatch.context() as m:
+        m.setattr(expsuite.futures, "ThreadPoolExecutor", no_pool)
+        assert [p["alpha"] for p in suite.get_params_many(few)] == list(range(len(few)))
+    params = suite.get_params_many(iter(exps))
+    assert [p["alpha"] for p in params] == list(range(len(exps)))
+    assert sorted(suite.reads) == sorted(exps)
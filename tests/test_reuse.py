@@ -0,0 +1,76 @@
+import os
+
+from expsuite import PyExperimentSuite
+
+CONFIG = """
+[DEFAULT]
+repetitions = 1
+iterations = %i
+path = results
+alpha = 1
+
+[a]
+
+[b]
+"""
+
+
+class StateSuite(PyExperimentSuite):
+    restore_supported = True
+
+    def reset(self, params, rep):
+        self.total = 0
+
+    def iterate(self, params, rep, n):
+        self.total += n
+        return {"total": self.total}
+
+    def save_state(self, params, rep, n):
+        f = open(os.path.join(params["path"], params["name"], "%i.state" % rep), "w")
+        f.write(str(self.total))
+        f.close()
+
+    def restore_state(self, params, rep, n):
+        f = open(os.path.join(params["path"], params["name"], "%i.state" % rep))
+        self.total = int(f.read())
+        f.close()
+
+    def state_files(self, params, rep):
+        return ["%i.state" % rep]
+
+
+def read(filename):
+    f = open(filename)
+    content = f.read()
+    f.close()
+    return content
+
+
+def test_reused_files_are_not_shared(make_suite, tmp_path):
+    cache = str(tmp_path / "cache")
+    suite = make_suite(StateSuite, CONFIG % 5, "--reuse", "--cache", cache, "-e", "a")
+    suite.start()
+    log, state = read("results/a/0.log"), read("results/a/0.state")
+
+    suite = make_suite(StateSuite, CONFIG % 5, "--reuse", "--cache", cache, "-e", "b")
+    suite.start()
+    assert read("results/b/0.log") == log
+    assert not os.path.samefile("results/a/0.log", "results/b/0.log")
+
+    # resuming b with more iterations must not touch the files of a
+    suite = make_suite(StateSuite, CONFIG % 8, "-e", "b")
+    suite.start()
+    assert len(suite.get_history("results/b", 0, "total")) == 8
+    assert read("results/a/0.log") == log
+    assert read("results/a/0.state") == state
+
+
+def test_compressed_files_are_linked(make_suite, tmp_path):
+    cache = str(tmp_path / "cache")
+    args = ("--reuse", "--cache", cache, "--compress", "gzip")
+    suite = make_suite(StateSuite, CONFIG % 5, "-e", "a", *args)
+    suite.start()
+    suite = make_suite(StateSuite, CONFIG % 5, "-e", "b", *args)
+    suite.start()
+    assert os.path.samefile("results/a/0.log.gz", "results/b/0.log.gz")
+    assert suite.get_history("results/b", 0, "total") == [0, 1, 3, 6, 10]
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from expsuite import PyExperimentSuite
+
+CONFIG = """
+[DEFAULT]
+repetitions = 3
+iterations = 5
+path = results
+
+[run]
+alpha = [1, 2]
+"""
+
+
+class Interrupted(Exception):
+    pass
+
+
+class RestoreSuite(PyExperimentSuite):
+    restore_supported = True
+
+    # (alpha, rep, iteration) that raises Interrupted in iterate
+    fail_at = None
+    running = 0
+    max_running = 0
+    restored = []
+
+    def reset(self, params, rep):
+        self.x = 0
+        RestoreSuite.running += 1
+        RestoreSuite.max_running = max(RestoreSuite.max_running, self.running)
+
+    def iterate(self, params, rep, n):
+        if self.fail_at == (params["alpha"], rep, n):
+            RestoreSuite.running -= 1
+            raise Interrupted("iteration %i" % n)
+        self.x += params["alpha"]
+        return {"x": self.x, "rep": rep}
+
+    def finalize(self, params, rep):
+        RestoreSuite.running -= 1
+
+    def state_name(self, params, rep):
+        return os.path.join(params["path"], params["name"], "%i.state" % rep)
+
+    def save_state(self, params, rep, n):
+        f = open(self.state_name(params, rep), "w")
+        f.write(str(self.x))
+        f.close()
+
+    def restore_state(self, params, rep, n):
+        RestoreSuite.restored.append((params["alpha"], rep, n))
+        f = open(self.state_name(params, rep))
+        self.x = int(f.read())
+        f.close()
+
+
+class AsyncRestoreSuite(RestoreSuite):
+    async def reset(self, params, rep):
+        await asyncio.sleep(0)
+        RestoreSuite.reset(self, params, rep)
+
+    async def iterate(self, params, rep, n):
+        # let the other repetitions of the worker run in between
+        await asyncio.sleep(0)
+        return RestoreSuite.iterate(self, params, rep, n)
+
+    async def save_state(self, params, rep, n):
+        await asyncio.sleep(0)
+        RestoreSuite.save_state(self, params, rep, n)
+
+    async def restore_state(self, params, rep, n):
+        await asyncio.sleep(0)
+        RestoreSuite.restore_state(self, params, rep, n)
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    RestoreSuite.fail_at = None
+    RestoreSuite.running = 0
+    RestoreSuite.max_running = 0
+    RestoreSuite.restored = []
+
+
+def check_logs(suite):
+    for exp in suite.get_exps("results/run"):
+        alpha = suite.get_params(exp)["alpha"]
+        for rep in range(3):
+            assert suite.get_history(exp, rep, "x") == [
+                alpha * (i + 1) for i in range(5)
+            ]
+            assert suite.get_history(exp, rep, "rep") == [rep] * 5
+
+
+def status_records():
+    f = open("results/status.jsonl")
+    records = [json.loads(line) for line in f]
+    f.close()
+    return records
+
+
+def test_async_suite_runs_repetitions_concurrently(make_suite):
+    suite = make_suite(AsyncRestoreSuite, CONFIG, "--concurrency", "3")
+    assert suite.is_async()
+    suite.start()
+    check_logs(suite)
+    assert RestoreSuite.max_running == 3
+    events = [r["event"] for r in status_records()]
+    assert events.count("start") == 6 and events.count("done") == 6
+
+
+@pytest.mark.parametrize(
+    "cls,args",
+    [
+        (RestoreSuite, ()),
+        (RestoreSuite, ("--concurrency", "2")),
+        (AsyncRestoreSuite, ()),
+        (AsyncRestoreSuite, ("--concurrency", "3")),
+    ],
+)
+def test_failure_is_recorded_and_restored(make_suite, cls, args):
+    RestoreSuite.fail_at = (2, 1, 3)
+    with pytest.raises(Interrupted):
+        make_suite(cls, CONFIG, *args).start()
+
+    failed = [r for r in status_records() if r["event"] == "failed"]
+    assert [(r["exp"], r["rep"]) for r in failed] == [("results/run/alpha2.0", 1)]
+    f = open("results/run/alpha2.0/1.log")
+    assert len(f.readlines()) == 3
+    f.close()
+
+    # the next run resumes the repetition after the last logged iteration
+    RestoreSuite.fail_at = None
+    suite = make_suite(cls, CONFIG, *args)
+    suite.start()
+    check_logs(suite)
+    assert RestoreSuite.restored == [(2, 1, 3)]
+    assert status_records()[-1]["event"] == "done"
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from expsuite import SAMPLING_TYPES, sample_points
+
+from conftest import SimpleSuite, make_config
+
+CONFIG = make_config(
+    repetitions=1,
+    iterations=1,
+    experiment="%s",
+    samples=10,
+    alpha="[1, 2, 3, 4, 5]",
+    beta="[0.1, 0.2, 0.3, 0.4]",
+)
+
+
+@pytest.mark.parametrize("method", SAMPLING_TYPES)
+@pytest.mark.parametrize("d", [1, 3, 21])
+def test_sample_points(method, d):
+    points = sample_points(method, 64, d, 0)
+    assert points.shape == (64, d)
+    assert (points >= 0).all() and (points < 1).all()
+    assert np.array_equal(points, sample_points(method, 64, d, 0))
+    assert not np.array_equal(points, sample_points(method, 64, d, 1))
+
+
+@pytest.mark.parametrize("method", ["lhs", "sobol"])
+def test_stratification(method):
+    # each of the 64 intervals of every dimension holds exactly one point
+    points = sample_points(method, 64, 21, 3)
+    for k in range(21):
+        counts = np.bincount((points[:, k] * 64).astype(int), minlength=64)
+        assert (counts == 1).all()
+
+
+def test_sobol_dimensions():
+    with pytest.raises(SystemExit):
+        sample_points("sobol", 4, 22, 0)
+
+
+@pytest.mark.parametrize("method", SAMPLING_TYPES)
+def test_sampling_experiment(make_suite, method):
+    suite = make_suite(SimpleSuite, CONFIG % method)
+    suite.start()
+    params = suite.get_params("results/exp")
+    exps = suite.get_exps("results/exp")
+    assert 0 < len(exps) <= 10
+    assert suite.count_sub_experiments(params) == len(exps)
+
+    tensor, axes = suite.get_results_tensor("results/exp", "y")
+    assert tensor.shape == (5, 4, 1)
+    assert np.isfinite(tensor).sum() == len(exps)
+    for exp in exps:
+        p = suite.get_params(exp)
+        index = (axes[0][1].index(p["alpha"]), axes[1][1].index(p["beta"]), 0)
+        assert tensor[index] == p["alpha"] * p["beta"]
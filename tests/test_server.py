@@ -0,0 +1,109 @@
+import http.server
+import json
+import socket
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import expsuite
+from expsuite import ResultsClient
+
+from conftest import SimpleSuite, make_config
+
+CONFIG = make_config(iterations=4, alpha="[1, 2]")
+
+
+@pytest.fixture
+def client(make_suite, monkeypatch):
+    direct = make_suite(SimpleSuite, CONFIG)
+    direct.start()
+
+    # remember the server so it can be shut down after the test
+    servers = []
+
+    base = http.server.ThreadingHTTPServer
+
+    class Server(base):
+        def __init__(self, *args, **kwargs):
+            base.__init__(self, *args, **kwargs)
+            servers.append(self)
+
+    monkeypatch.setattr(http.server, "ThreadingHTTPServer", Server)
+    s = socket.socket()
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+
+    served = make_suite(SimpleSuite, CONFIG)
+    thread = threading.Thread(target=served.serve, kwargs={"port": port})
+    thread.daemon = True
+    thread.start()
+    for i in range(100):
+        client = ResultsClient(make_suite(SimpleSuite, CONFIG), port=port)
+        if client.connected:
+            break
+        time.sleep(0.05)
+    assert client.connected
+    yield direct, client
+    servers[0].shutdown()
+    thread.join()
+    servers[0].server_close()
+
+
+def normalized(result):
+    return json.loads(json.dumps(result, default=expsuite.to_json))
+
+
+def test_served_methods_match_direct_calls(client):
+    direct, client = client
+    exp = "results/exp"
+    sub = "results/exp/alpha1.0"
+    calls = [
+        ("get_exps", (exp,), {}),
+        ("get_exps", (), {"path": exp}),
+        ("get_params", (sub,), {}),
+        ("get_history", (sub, 1, "x"), {}),
+        ("get_history", (sub,), {"rep": 0, "tags": ["x", "n"]}),
+        ("get_history_tags", (sub, 0), {}),
+        ("get_value", (sub, 1, "x", "max"), {}),
+        ("get_value", (sub, 1, "x"), {"which": "min"}),
+        ("get_values_fix_params", (exp, 0, "x"), {"alpha": 2}),
+        ("get_histories_fix_params", (exp, 1, "n"), {"alpha": 1}),
+        ("get_histories_over_repetitions", (sub, "x", np.mean), {}),
+        ("get_histories_over_repetitions", (sub, "x"), {"aggregate": np.max}),
+        (
+            "get_histories_over_repetitions",
+            (sub,),
+            {"tags": "all", "aggregate": np.min},
+        ),
+    ]
+    assert set(c[0] for c in calls) == set(expsuite.SERVED_METHODS)
+
+    for method, args, kwargs in calls:
+        expected = getattr(direct, method)(*args, **kwargs)
+        result = client.query(method, args, kwargs)
+        assert client.connected, method
+        assert normalized(result) == normalized(expected), (method, args, kwargs)
+        assert type(result) == type(expected), method
+
+
+def test_server_answers_bad_queries(client):
+    import urllib.error
+    import urllib.request
+
+    direct, client = client
+    for method, body in [
+        ("get_histories_over_repetitions", '{"args": ["results/exp"]}'),
+        ("get_histories_over_repetitions", '{"kwargs": {"aggregate": "nope"}}'),
+        ("get_value", "not json"),
+        ("get_value", '{"args": ["results/missing", 0, "x"]}'),
+    ]:
+        request = urllib.request.Request(
+            client.url + "/" + method, data=body.encode("utf-8")
+        )
+        with pytest.raises(urllib.error.HTTPError) as e:
+            urllib.request.urlopen(request, timeout=10)
+        assert 400 <= e.value.code < 600
+        assert "error" in json.loads(e.value.read().decode("utf-8"))
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+
+from expsuite import PyExperimentSuite
+
+CONFIG = """
+[DEFAULT]
+repetitions = 3
+iterations = 6
+path = results
+
+[exp]
+alpha = [1, 2]
+"""
+
+
+class ValueSuite(PyExperimentSuite):
+    def iterate(self, params, rep, n):
+        x = np.sin(params["alpha"] * 3.0 * n + rep)
+        return {"x": float(x), "loss": float(np.cos(n + rep * params["alpha"]))}
+
+
+@pytest.fixture
+def results(make_suite):
+    suite = make_suite(ValueSuite, CONFIG)
+    suite.start()
+    exps = sorted(suite.get_exps("results/exp"))
+
+    # one shorter (unfinished) and one missing repetition
+    logname = os.path.join(exps[0], "1.log")
+    f = open(logname)
+    lines = f.readlines()
+    f.close()
+    f = open(logname, "w")
+    f.writelines(lines[:3])
+    f.close()
+    os.remove(os.path.join(exps[1], "2.log"))
+    return suite, exps
+
+
+@pytest.mark.parametrize("which", ["last", "min", "max", 0, 2, 4, -1, -3, -5])
+def test_get_values_matches_get_value(results, which):
+    suite, exps = results
+    values = suite.get_values(exps, "x", which)
+    assert values.shape == (2, 3)
+    for i, exp in enumerate(exps):
+        for rep in range(3):
+            history = suite.get_history(exp, rep, "x")
+            if not history or (
+                type(which) == int and not -len(history) <= which < len(history)
+            ):
+                assert np.isnan(values[i, rep])
+            else:
+                assert values[i, rep] == suite.get_value(exp, rep, "x", which)
+
+
+@pytest.mark.parametrize(
+    "which, func",
+    [
+        ("first", lambda h: h[0]),
+        ("mean", np.mean),
+        ("median", np.median),
+        ("std", np.std),
+        ("p90", lambda h: np.percentile(h, 90)),
+        ("argmin", np.argmin),
+        ("argmax", np.argmax),
+    ],
+)
+def test_get_values_reducers(results, which, func):
+    suite, exps = results
+    values = suite.get_values(exps, "x", which)
+    for i, exp in enumerate(exps):
+        for rep in range(3):
+            history = suite.get_history(exp, rep, "x")
+            if not history:
+                assert np.isnan(values[i, rep])
+            else:
+                assert np.isclose(values[i, rep], func(np.array(history)))
+
+
+def test_get_values_at_min(results):
+    suite, exps = results
+    values = suite.get_values(exps, ["x", "loss"], ("at_min", "loss"))
+    assert sorted(values.keys()) == ["loss", "x"]
+    for i, exp in enumerate(exps):
+        for rep in range(3):
+            history = suite.get_history(exp, rep, ["x", "loss"])
+            if not history:
+                assert np.isnan(values["x"][i, rep])
+                continue
+            index = int(np.argmin(history["loss"]))
+            assert values["x"][i, rep] == history["x"][index]
+            assert values["loss"][i, rep] == min(history["loss"])
+
+
+def test_get_values_selected_repetitions(results):
+    suite, exps = results
+    values = suite.get_values(exps, "x", "last", reps=[2])
+    assert values.shape == (2, 1)
+    assert values[0, 0] == suite.get_value(exps[0], 2, "x")
+    assert np.isnan(values[1, 0])
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from expsuite import PyExperimentSuite
+
+CONFIG = """
+[DEFAULT]
+repetitions = 1
+iterations = 2
+path = results
+
+[w]
+warmstart = lr
+momentum = [0.5, 0.9]
+lr = [0.1, 0.01, 0.001]
+"""
+
+
+class WarmSuite(PyExperimentSuite):
+    restore_supported = True
+
+    def reset(self, params, rep):
+        self.x = 0.0
+        self.source = "none"
+
+    def warm_start(self, params, rep, source_path):
+        f = open(os.path.join(source_path, "%i.state" % rep))
+        self.x = float(f.read())
+        f.close()
+        self.source = os.path.basename(source_path)
+
+    def iterate(self, params, rep, n):
+        self.x += params["lr"]
+        return {"x": self.x, "source": self.source}
+
+    def save_state(self, params, rep, n):
+        f = open(os.path.join(params["path"], params["name"], "%i.state" % rep), "w")
+        f.write(str(self.x))
+        f.close()
+
+
+def sources(suite):
+    return dict(
+        (os.path.basename(exp), suite.get_value(exp, 0, "source"))
+        for exp in suite.get_exps("results/w")
+    )
+
+
+def test_warm_start_from_nearest_neighbour(make_suite):
+    suite = make_suite(WarmSuite, CONFIG)
+    suite.start()
+    assert sources(suite) == {
+        "momentum0.50lr0.10": "none",
+        "momentum0.90lr0.10": "none",
+        "momentum0.50lr0.010": "momentum0.50lr0.10",
+        "momentum0.90lr0.010": "momentum0.90lr0.10",
+        "momentum0.50lr0.0010": "momentum0.50lr0.010",
+        "momentum0.90lr0.0010": "momentum0.90lr0.010",
+    }
+    assert suite.get_value("results/w/momentum0.50lr0.0010", 0, "x") == pytest.approx(
+        0.222
+    )
+
+
+def test_no_warm_start_from_previous_run_with_del(make_suite):
+    suite = make_suite(WarmSuite, CONFIG)
+    suite.start()
+    before = sources(suite)
+
+    # the points with lr 0.1 run first, their neighbours are still those of
+    # the previous run, which are deleted later
+    suite = make_suite(WarmSuite, CONFIG, "-d")
+    suite.start()
+    assert sources(suite) == before
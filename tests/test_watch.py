@@ -0,0 +1,42 @@
+import json
+import time
+
+import pytest
+
+from conftest import SimpleSuite, make_config
+
+CONFIG = make_config(names=("A", "B"), alpha="[1, 2]")
+
+
+def status_records():
+    f = open("results/status.jsonl")
+    records = [json.loads(line) for line in f]
+    f.close()
+    return records
+
+
+def test_watch_counts_only_selected_experiments(make_suite, capsys, monkeypatch):
+    make_suite(SimpleSuite, CONFIG, "-e", "A").start()
+    capsys.readouterr()
+
+    def interrupt(seconds):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(time, "sleep", interrupt)
+    suite = make_suite(SimpleSuite, CONFIG, "-w", "-e", "B")
+    with pytest.raises(SystemExit):
+        suite.start()
+    out = capsys.readouterr().out
+    assert "0 done, 0 active, 4 queued, 0 failed" in out
+
+
+def test_delete_keeps_status_of_other_experiments(make_suite):
+    make_suite(SimpleSuite, CONFIG).start()
+    assert len(status_records()) == 16
+
+    make_suite(SimpleSuite, CONFIG, "-e", "B", "--del").start()
+    records = status_records()
+    assert len(records) == 16
+    # the records of A are kept, those of B are from the new run
+    assert all(r["exp"].startswith("results/A/") for r in records[:8])
+    assert all(r["exp"].startswith("results/B/") for r in records[8:])